@@ -0,0 +1,87 @@
+"""
+Startup and deferred asset loading.
+
+GameEngine builds its subsystems through AssetManager.build, which times each one for the
+startup report (--startup-report). Files are decoded on a thread pool: submit runs a decode
+function there (pygame's image and sound loaders let go of the GIL while they work) and hands
+its result to a finish function on the main thread, either when pump gets to it between frames
+or straight away when wait is asked for it. Anything that touches the display, like
+convert_alpha, belongs in the finish function.
+"""
+
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple, TYPE_CHECKING
+from constants import ASSET_PUMP_BUDGET_MS
+if TYPE_CHECKING:
+    from ultimalike import GameEngine
+
+class AssetManager:
+    def __init__(self, engine: 'GameEngine'):
+        self.engine = engine
+        self.timings: Dict[str, float] = {}#subsystem -> ms spent building it
+        self.pool: ThreadPoolExecutor = None
+        self.workers = os.cpu_count() or 1
+        self.pending: Dict[str, Tuple[Future, Callable]] = {}#label -> (decode running on the pool, finish for the main thread)
+        self.finished = 0
+        self.finish_ms = 0.0
+
+    def build(self, name: str, factory: Callable, *args) -> Any:
+        """Call factory(*args), timing it under name"""
+        start = time.perf_counter()
+        result = factory(*args)
+        self.timings[name] = (time.perf_counter() - start) * 1000
+        return result
+
+    def submit(self, label: str, decode: Callable[[], Any], finish: Callable[[Any], None]):
+        """Run decode on the pool, then finish(decoded) on the main thread. Labels must be unique while pending."""
+        if not self.pool:
+            self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="assets")
+        self.pending[label] = (self.pool.submit(decode), finish)
+
+    def _finish(self, label: str) -> bool:
+        future, finish = self.pending.pop(label)
+        try:
+            decoded = future.result()
+        except Exception as e:
+            print(f"Could not load {label}: {e}")
+            return False
+        start = time.perf_counter()
+        finish(decoded)
+        self.finish_ms += (time.perf_counter() - start) * 1000
+        self.finished += 1
+        return True
+
+    def wait(self, label: str) -> bool:
+        """Finish label now if it's pending, waiting for its decode if need be. False if it wasn't pending or failed."""
+        return label in self.pending and self._finish(label)
+
+    def wait_all(self, prefix: str = ""):
+        for label in [label for label in self.pending if label.startswith(prefix)]:
+            self.wait(label)
+
+    def pump(self, budget_ms: float = ASSET_PUMP_BUDGET_MS):
+        """Finish decoded assets, oldest first, for up to budget_ms. Called between frames."""
+        if not self.pending:
+            return
+        deadline = time.perf_counter() + budget_ms / 1000
+        for label, (future, _) in list(self.pending.items()):
+            if time.perf_counter() >= deadline:
+                break
+            if future.done():
+                self._finish(label)
+
+    def stop(self):
+        """Drop whatever hasn't been decoded yet, before pygame shuts down"""
+        if self.pool:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+        self.pending.clear()
+
+    def report(self):
+        total = sum(self.timings.values())
+        print(f"Startup {total:.1f} ms")
+        for name, ms in sorted(self.timings.items(), key=lambda item: -item[1]):
+            print(f"    {name:<24}{ms:9.1f} ms")
+        print(f"Decoded on up to {self.workers} threads: {self.finished} finished ({self.finish_ms:.1f} ms on the main thread), {len(self.pending)} pending")
@@ -0,0 +1,162 @@
+"""
+Benchmarks for the engine's hot paths, run headless.
+
+    python benchmarks.py [names...] [--repeat N] [--out results.json] [--compare old_results.json]
+
+Each benchmark reports min/median/mean/max milliseconds per call. Results are written as
+JSON together with the git commit they were measured on, so two runs can be compared
+with --compare. Pass benchmark names (or name prefixes, like load_map) to run only those.
+"""
+
+import os
+import json
+import time
+import shutil
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+import contextlib
+from typing import Callable, Dict
+os.environ["YAF_HEADLESS"] = "1"
+import pygame
+from constants import *
+import ultimalike
+from objects.map_objects import Map
+from objects.object_templates import NPC
+from sprites.sprites import replace_color_threshold
+
+BENCH_SAVE = "save_Kesvelt_Ground_0"
+BENCH_TMP_SAVE = "benchmark_tmp"
+BENCH_COMBAT_MAP = "Battle Test Map"
+TURN_HISTORY_SIZES = [1000, 10000, 100000]
+
+def time_calls(func: Callable, repeat: int, setup: Callable = None) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"min" : min(samples), "median" : statistics.median(samples), "mean" : statistics.fmean(samples), "max" : max(samples), "repeat" : repeat}
+
+def make_engine() -> 'ultimalike.GameEngine':
+    random.seed(0)
+    engine = ultimalike.GameEngine(headless = True)
+    engine.save_manager.load_game(BENCH_SAVE)
+    engine.step(2)
+    return engine
+
+def enter_test_combat(engine: 'ultimalike.GameEngine'):
+    """Put the party on the battle test map and start a fight"""
+    engine.load_map(BENCH_COMBAT_MAP)
+    for member in engine.party.members:
+        engine.current_map.remove_object(member)
+    engine.current_map = engine.maps[BENCH_COMBAT_MAP]
+    spawn = engine.current_map.get_object_by_name(NEW_GAME_SPAWNER).position
+    for i, member in enumerate(engine.party.members):
+        member.position = member.old_position = member.add_tuples(spawn, (i, 0))
+        member.map = engine.current_map
+        engine.current_map.add_object(member)
+    engine.combat_manager.enter_combat_mode()
+
+def combat_round(engine: 'ultimalike.GameEngine'):
+    """Every party member ends their turn, then every enemy takes theirs (animations skipped)"""
+    combat_manager = engine.combat_manager
+    while combat_manager.player_turn:
+        combat_manager.player_moved = combat_manager.player_actioned = True
+        combat_manager.advance_turn()
+    while not combat_manager.player_turn:
+        combat_manager.finish_current_enemy_turn()
+
+def run_benchmarks(selected: list[str], repeat: int) -> Dict[str, dict]:
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        engine = make_engine()
+    leader = engine.party.get_leader()
+    benchmarks: Dict[str, tuple] = {}#name -> (func, setup, repeat)
+
+    for map_name in sorted(os.listdir(MAPS_DIR)):
+        if os.path.isdir(os.path.join(MAPS_DIR, map_name)):
+            load = lambda map_name=map_name: Map.load_from_files(map_name, engine.map_obj_db, engine.tile_db, engine)
+            benchmarks[f"load_map[{map_name}]"] = (load, None, repeat)
+
+    def clear_fov_cache():
+        engine.renderer._fov_cache_key = None
+    benchmarks["get_visible_positions"] = (lambda: engine.renderer.get_visible_positions(leader.position, MAP_WIDTH), clear_fov_cache, repeat * 10)
+    benchmarks["render_map"] = (engine.renderer.render_map, None, repeat * 10)
+    benchmarks["render_frame"] = (engine.render, engine.renderer.damage_all, repeat * 10)#A full redraw, not an idle frame
+
+    scheduled_npcs = [obj for obj in engine.current_map.get_objects_subset(NPC) if obj.name in engine.schedule_manager.schedules]
+    npc = scheduled_npcs[0] if scheduled_npcs else None
+    for size in TURN_HISTORY_SIZES:
+        def use_history(size=size):
+            engine.schedule_manager.turn_history = [1 if i % 7 else 2 for i in range(size)]
+        if npc:
+            benchmarks[f"get_npc_schedule_status[{size}]"] = (lambda: engine.schedule_manager.get_npc_schedule_status(npc.name, npc.move_interval), use_history, repeat)
+
+    def save():
+        engine.save_manager.save_game(BENCH_TMP_SAVE)
+        engine.save_manager.writer.flush()
+    def dirty_all_maps():
+        for game_map in engine.maps.values():
+            game_map.dirty = True
+    benchmarks["save_game"] = (save, dirty_all_maps, repeat)
+    benchmarks["load_game"] = (lambda: engine.save_manager.load_game(BENCH_TMP_SAVE), save, repeat)
+
+    people_sheet = next((name for name in engine.sprite_db.sheet_files if name.startswith("Generic People")), None)
+    if people_sheet:
+        sheet = engine.sprite_db.get_sheet(people_sheet)
+        benchmarks["replace_color_threshold"] = (lambda: replace_color_threshold(sheet.copy(), GRAY, engine.sprite_db.common_skin_colors[0]), None, repeat)
+
+    benchmarks["combat_round"] = (lambda: combat_round(engine), lambda: (engine.save_manager.load_game(BENCH_SAVE), enter_test_combat(engine)), repeat)
+
+    results = {}
+    try:
+        for name, (func, setup, times) in benchmarks.items():
+            if selected and not any(name.startswith(prefix) for prefix in selected):
+                continue
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):#The game prints a lot
+                results[name] = time_calls(func, times, setup)
+            print(f"{name:<44}{results[name]['median']:10.3f} ms median  {results[name]['min']:10.3f} ms min", flush = True)
+    finally:
+        shutil.rmtree(os.path.join(SAVES_DIR, BENCH_TMP_SAVE), ignore_errors = True)
+    return results
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output = True, text = True).stdout.strip()
+    except OSError:
+        return ""
+
+def compare(results: Dict[str, dict], old_filepath: str):
+    with open(old_filepath, 'r') as f:
+        old = json.load(f)
+    print(f"\nCompared to {old.get('commit', old_filepath)} (median):")
+    for name, row in results.items():
+        if name in old["results"]:
+            before = old["results"][name]["median"]
+            change = (row["median"] - before) / before * 100 if before else 0.0
+            print(f"{name:<44}{before:10.3f} -> {row['median']:10.3f} ms  {change:+7.1f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("names", nargs = "*", help = "only run benchmarks whose names start with these")
+    parser.add_argument("--repeat", type = int, default = 5)
+    parser.add_argument("--out", default = "benchmark_results.json")
+    parser.add_argument("--compare", help = "earlier results file to compare against")
+    args = parser.parse_args()
+    results = run_benchmarks(args.names, args.repeat)
+    with open(args.out, 'w') as f:
+        json.dump({
+            "commit" : git_commit(),
+            "time" : time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python" : platform.python_version(),
+            "pygame" : pygame.version.ver,
+            "results" : results
+        }, f, indent = 2)
+    print(f"Results written to {args.out}")
+    if args.compare:
+        compare(results, args.compare)
+    pygame.quit()
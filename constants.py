@@ -1,6 +1,4 @@
 from enum import Enum
-from functools import wraps
-import time
 # Constants
 SCREEN_WIDTH = 1212
 SCREEN_HEIGHT = 768
@@ -18,6 +16,21 @@ DEFAULT_MOVEMENT_PENALTY = 1
 DEFAULT_WAIT_PENALTY = 2
 DEFAULT_OVERWORLD_MOVEMENT_PENALTY = 5
 ACTION_AND_MOVEMENT_LEVEL = 0
+# Game loop
+SIM_STEP_MS = 16#Game logic always advances in steps of this many ms, however fast frames are drawn
+MAX_SIM_STEPS_PER_FRAME = 5#Frames skipped under load before the game slows down instead
+DEFAULT_MAX_FPS = 60#0 draws as fast as possible
+ASSET_PUMP_BUDGET_MS = 4#Main thread time per frame spent finishing assets decoded in the background
+MAP_PRELOAD_CACHE_SIZE = 8#Maps parsed ahead of the party moving onto them (see MapPreloader)
+MAP_RESIDENCY_LIMIT = 8#Maps kept built in GameEngine.maps; the least recently visited beyond this are packed into records (0 keeps all)
+CURSOR_BLINK_MS = 500
+# Performance HUD
+PERF_HUD_WIDTH = 240
+PERF_HUD_HEIGHT = 265
+PERF_HUD_GRAPH_FRAMES = 180#3 seconds at 60 fps
+PERF_HUD_GRAPH_HEIGHT = 60
+PERF_HUD_GRAPH_MAX_MS = 50
+PERF_HUD_SUBSYSTEMS = ["input", "update", "events", "combat", "render_map", "sidebar", "flip"]
 # Directories
 MAPS_DIR = "maps"
 SAVES_DIR = "saves"
@@ -156,6 +169,10 @@ class ObjectState(Enum):
     POSE = "pose"
     GINNY_GET_UP = "ginny_get_up"
     IMEDES_AMBUSH = "imedes_ambush"
+#Full-screen menus, which don't show the map
+MENU_STATES = [GameState.MAIN_MENU, GameState.MENU_STATS, GameState.MENU_INVENTORY, GameState.MENU_EQUIPMENT, GameState.MENU_SHOPPING, GameState.MENU_OPTIONS, GameState.MENU_SAVE_LOAD, GameState.MENU_QUEST_LOG]
+#Object states animated frame by frame rather than by a timer's progress
+ANIMATED_OBJECT_STATES = {ObjectState.BURNING, ObjectState.BLUSHING, ObjectState.EVIL}
 
 class TileType(Enum):
     GRASS = '.'
@@ -289,17 +306,3 @@ class QuestStatus(Enum):
     ACTIVE = "a"
     COMPLETED = "c"
     FAILED = "f"
-    
-
-def time_function(label=None):
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            start = time.perf_counter()
-            result = func(*args, **kwargs)
-            end = time.perf_counter()
-            duration = (end - start) * 1000  # ms
-            print(f"[TIME] {label or func.__name__} took {duration:.3f} ms")
-            return result
-        return wrapper
-    return decorator
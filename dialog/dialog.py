@@ -87,7 +87,7 @@ class DialogManager:
         self.engine.event_manager.talked_to_npcs.add(self.dialog_key)
         
         self.current_speaker = npc
-        self.current_speaker.state = ObjectState.TALK
+        self.current_speaker.set_state(ObjectState.TALK)
         npc_id = f"{dialog_key}"
         self.dialog_key = npc_id
         
@@ -104,7 +104,7 @@ class DialogManager:
         self.user_input = ""
         self.awaiting_keyword = True if len(self.current_lines) == 1 else False
         self.waiting_for_input = True
-        self.cursor_blink = 0
+        self.cursor_blink = self.engine.event_manager.timer_manager.now()#when the cursor started blinking
         return True
     
     def start_looking(self, obj: MapObject):
@@ -197,7 +197,7 @@ class DialogManager:
         if input_lower == "bye":
             self.end_dialog()
             return
-        self.current_speaker.state = ObjectState.TALK
+        self.current_speaker.set_state(ObjectState.TALK)
 
         if npc.__is__(ElevatorHelper):
             config = npc.args.get("elevator_config", {}) or dialog_data.get("elevator_config", {})
@@ -18,20 +18,25 @@ def evention(key):
         return func
     return decorator
 class TimerManager:
+    ticks: int = None#Set by GameEngine to its simulation clock, a virtual millisecond count that replaces the wall clock
     def __init__(self):
         self.timers = {}
     
+    @staticmethod
+    def now() -> int:
+        return pygame.time.get_ticks() if TimerManager.ticks is None else TimerManager.ticks
+    
     def start_timer(self, name: str, duration: int | float, is_active: bool = True):
         """Start a new timer"""
         self.timers[name] = {
-            'start_time': pygame.time.get_ticks(),
+            'start_time': self.now(),
             'duration': duration,
             'active': is_active
         }
     
     def restart_timer(self, name: str):
         if name in self.timers:
-            self.timers[name]['start_time'] = pygame.time.get_ticks()
+            self.timers[name]['start_time'] = self.now()
     
     def is_active(self, name):
         """Check if a timer is currently running"""
@@ -52,7 +57,7 @@ class TimerManager:
             return 1.0
         
         timer = self.timers[name]
-        elapsed = pygame.time.get_ticks() - timer['start_time']
+        elapsed = self.now() - timer['start_time']
         progress = min(elapsed / timer['duration'], 1.0)
         
         if progress >= 1.0 and cancel_if_done:
@@ -66,7 +71,7 @@ class TimerManager:
             return 0
         
         timer = self.timers[name]
-        elapsed = pygame.time.get_ticks() - timer['start_time']
+        elapsed = self.now() - timer['start_time']
         remaining_time = max(0, timer['duration'] - elapsed)
         if remaining_time <= 0 and cancel_if_done:
             self.cancel_timer(name)
@@ -244,9 +249,9 @@ class EventManager:
                 obj.map.remove_object(obj)
             obj.map = new_map
             new_map.add_object(obj)
-        if not (0 <= new_pos[0] < len(obj.map.tiles[0]) or 0 <= new_pos[1] < len(obj.map.tiles)):#Give an error if trying to move object out of bounds
+        if not (0 <= new_pos[0] < obj.map.width or 0 <= new_pos[1] < obj.map.height):#Give an error if trying to move object out of bounds
             raise IndexError
-        obj.position = new_pos
+        obj.set_position(new_pos)
         return True
     
     def initialize_walk(self, instructions: str):
@@ -295,7 +300,7 @@ class EventManager:
             self.walk_directions[i] = self.walk_directions[i][1:]
             if obj.map.is_passable(tpos) or ignore_walls:
                 obj.old_position = obj.position
-                obj.position = tpos
+                obj.set_position(tpos)
                 obj.last_move_direction = direc.value
         for i in reversed(walk_complete):
             self.timer_manager.cancel_timer(f"event_wait_{self.walkers[i].name}", True)
@@ -468,7 +473,7 @@ class EventManager:
             if "--" in new_state:
                 new_state, state_time = new_state.split("--")
                 self.engine.event_manager.timer_manager.start_timer(f"event_play_{obj.name}", int(state_time))
-            obj.state = ObjectState(new_state)
+            obj.set_state(ObjectState(new_state))
         except:
             raise Exception(f"{obj_name} could not be found on {self.engine.current_map.name}")
 
@@ -528,7 +533,7 @@ class EventManager:
             obj = self.engine.current_map.get_object_by_name(destination)
             if npc and obj:
                 npc.old_position = obj.position
-                npc.position = obj.position
+                npc.set_position(obj.position)
 
     @evention("spawn")
     def spawn(self, line: str):
@@ -696,7 +701,7 @@ class EventManager:
             case "reset_map":
                 for obj in self.engine.current_map.objects:
                     obj.old_position = obj.init_position
-                    obj.position = obj.init_position
+                    obj.set_position(obj.init_position)
             case "set_flag":
                 self.set_flag(line)
             case "del_flag":
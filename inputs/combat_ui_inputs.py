@@ -48,7 +48,7 @@ def combat_inputs(self: 'GameEngine', event):
                     self.combat_manager.player_move_direction = None
                 if self.current_map.is_passable(tpos):
                     current_unit.old_position = current_unit.position
-                    current_unit.position = tpos
+                    current_unit.set_position(tpos)
                     self.event_manager.timer_manager.start_timer("player_move", 180)
                     self.combat_manager.player_moved = True
                     self.combat_manager.player_move_direction = direc
@@ -59,7 +59,7 @@ def combat_inputs(self: 'GameEngine', event):
                 warp_node = self.current_map.get_object_by_name("map_edge_teleporter")
                 if warp_node and (tpos[0] < 0 or tpos[0] >= self.current_map.width or tpos[1] < 0 or tpos[1] >= self.current_map.height):
                     current_unit.old_position = current_unit.position
-                    current_unit.position = tpos
+                    current_unit.set_position(tpos)
                     self.event_manager.timer_manager.start_timer("player_move", 180)
                     self.combat_manager.conclude_current_player_turn()
                     self.current_map.remove_object(current_unit)
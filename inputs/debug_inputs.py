@@ -2,18 +2,32 @@ from typing import TYPE_CHECKING
 import pygame
 from constants import GameState, DEFAULT_PLAYER_MOVE_FRAMES, DEFAULT_WAIT_PENALTY
 from objects.object_templates import NPC, MapObject, Chest
+from profiler import profiler
 
 if TYPE_CHECKING:
     from ultimalike import GameEngine
 
 def debug_inputs(self: 'GameEngine', event):
-    mods = pygame.key.get_mods()
+    mods = event.mod
     if mods & pygame.KMOD_CTRL:
         match event.key:
             case pygame.K_d:
                 self.dialog_manager.load_dialogs()
             case pygame.K_e:
                 self.event_manager.load_event_scripts()
+            case pygame.K_p:
+                self.append_to_message_log(f"Profiler {'on' if profiler.toggle() else 'off'}.")
+            case pygame.K_h:
+                #The HUD's per-subsystem timings come from the profiler, so they're switched together
+                self.renderer.show_perf_hud = not self.renderer.show_perf_hud
+                profiler.enable() if self.renderer.show_perf_hud else profiler.disable()
+            case pygame.K_m:
+                if not self.memory_monitor.toggle():
+                    self.memory_monitor.report()
+                self.append_to_message_log(f"Memory telemetry {'on' if self.memory_monitor.enabled else 'off'}.")
+            case pygame.K_t:
+                profiler.print_stats()
+                self.append_to_message_log(f"Trace written to {profiler.export_chrome_trace()}")
     elif event.key == pygame.K_ESCAPE:
         self.dialog_manager.user_input = ""
         self.change_state(GameState.TOWN)
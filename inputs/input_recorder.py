@@ -0,0 +1,47 @@
+import json
+import random
+import hashlib
+import pygame
+from typing import List, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ultimalike import GameEngine
+
+def state_digest(engine: 'GameEngine') -> str:
+    """A hash of the party, the current map and the game clock, for checking a replay ended where the recording did"""
+    state = {
+        "party" : engine.party.to_dict(),
+        "map" : engine.current_map.name if engine.current_map else "",
+        "objects" : engine.current_map.to_dict() if engine.current_map else {},
+        "time" : str(engine.schedule_manager.current_game_time),
+        "turns" : len(engine.schedule_manager.turn_history)
+    }
+    return hashlib.sha1(json.dumps(state, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class InputRecorder:
+    """
+    Records a play session so it can be replayed exactly: the RNG seed, every key press with the
+    frame it arrived on and how long each frame lasted (timers run off those frame lengths while recording).
+    Replay the saved file with ScriptedInput.from_file.
+    """
+    def __init__(self, filepath: str, seed: int = None, load: str = None):
+        self.filepath = filepath
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.load = load#save folder the session starts from, if any
+        self.events: List[list] = []#[frame, key, unicode, mod]
+        self.frame_lengths: List[int] = []
+
+    def record(self, frame: int, events: List[pygame.event.Event]):
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                self.events.append([frame, event.key, event.unicode, event.mod])
+
+    def save(self, engine: 'GameEngine'):
+        with open(self.filepath, 'w') as f:
+            json.dump({
+                "seed" : self.seed,
+                "load" : self.load,
+                "frame_lengths" : self.frame_lengths,
+                "events" : self.events,
+                "digest" : state_digest(engine)
+            }, f)
+        print(f"Recorded {len(self.frame_lengths)} frames to {self.filepath}")
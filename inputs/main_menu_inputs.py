@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING
 import pygame
-from save_manager import SaveManager
 from constants import GameState
 
 if TYPE_CHECKING:
@@ -40,7 +39,7 @@ def save_load_inputs(self: 'GameEngine', event):
             self.revert_state()
         case pygame.K_UP | pygame.K_DOWN:
             dx, dy = self.get_direction(event.key).value
-            save_files = SaveManager.get_save_files()
+            save_files = self.save_manager.get_save_files()
             max_index = len(save_files) + (1 if self.is_save_mode else 0)
             self.selected_save = (self.selected_save + dy) % max_index
         case pygame.K_RETURN:
@@ -0,0 +1,55 @@
+import json
+import pygame
+from typing import Dict, List, Tuple
+
+class ScriptedInput:
+    """
+    Stands in for pygame's event queue, handing GameEngine.handle_input a fixed set of key presses
+    frame by frame so the game can be played without a keyboard.
+    Keys can be given as pygame key codes or pygame key names ("up", "return", "t"...).
+    A script made from a recording (see InputRecorder) also replays the recorded frame lengths and RNG seed.
+    """
+    def __init__(self, script: Dict[int, List[int | str]] = None):
+        self.script: Dict[int, List[Tuple[int, str, int]]] = {}#frame -> (key, unicode, mod) pressed that frame
+        self.frame = 0
+        self.frame_lengths: List[int] = []#ms each frame lasted when recorded
+        self.seed: int = None
+        self.load: str = None#save folder the recording started from
+        for frame, keys in (script or {}).items():
+            for key in keys:
+                self.press(int(frame), key)
+
+    @classmethod
+    def from_file(cls, filepath: str) -> 'ScriptedInput':
+        """Load either a script saved as {"frame": ["key", ...]} or a recording saved by InputRecorder"""
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+        if "events" not in data:
+            return cls(data)
+        scripted_input = cls()
+        for frame, key, unicode, mod in data["events"]:
+            scripted_input.press(frame, key, unicode, mod)
+        scripted_input.frame_lengths = data.get("frame_lengths", [])
+        scripted_input.seed = data.get("seed")
+        scripted_input.load = data.get("load")
+        return scripted_input
+
+    def press(self, frame: int, key: int | str, unicode: str = None, mod: int = 0):
+        if type(key) == str:
+            key = pygame.key.key_code(key)
+        if unicode is None:
+            name = pygame.key.name(key)
+            unicode = name if len(name) == 1 else ""
+        self.script.setdefault(frame, []).append((key, unicode, mod))
+
+    def finished(self) -> bool:
+        return self.frame > max(self.script, default=-1) and self.frame >= len(self.frame_lengths)
+
+    def frame_length(self, frame: int, default: int) -> int:
+        return self.frame_lengths[frame] if frame < len(self.frame_lengths) else default
+
+    def get(self) -> List[pygame.event.Event]:
+        """Same role as pygame.event.get: the events for the current frame"""
+        events = [pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode, mod=mod) for key, unicode, mod in self.script.get(self.frame, [])]
+        self.frame += 1
+        return events
@@ -40,8 +40,8 @@ class Spell:
         if self.effect_type == EffectType.MOVE:
             move_dist = random.randint(self.range_min, self.range)
             caster.old_position = caster.position
-            caster.position = caster.add_tuples(spell_target, caster.multiply_tuples(direction, move_dist))
-            caster.state = ObjectState.VORTEX
+            caster.set_position(caster.add_tuples(spell_target, caster.multiply_tuples(direction, move_dist)))
+            caster.set_state(ObjectState.VORTEX)
             caster.engine.event_manager.timer_manager.start_timer("player_move", 80*move_dist)
         for i in range(self.range):
             spell_target = tuple(a + b for a, b in zip(spell_target, direction))
@@ -70,7 +70,7 @@ class Spell:
                     target.engine.map_obj_db.create_obj("proj", self.projectile, {"old_position" : caster.position, "position" : "target.position"})
                     target.engine.current_map.add_object("proj")
             case EffectType.AREA_DAMAGE:
-                caster.state = ObjectState.STAFF_SLAM
+                caster.set_state(ObjectState.STAFF_SLAM)
                 print("Debug: Arrived at area damage effect type")
                 if "offset_layers" in self.args:
                     start_delay = 0
@@ -0,0 +1,56 @@
+"""
+Background map loading.
+
+Once a map becomes current, MapPreloader has the asset pool parse the maps the party can reach
+straight from it: the ones across its edges and the ones its teleporters lead to. Map.parse_files
+reads their files and builds their tiles off the main thread; making the objects pulls in sprites,
+so that part is left to GameEngine.load_map, which takes the parsed files from here instead of
+reading them again. At most MAP_PRELOAD_CACHE_SIZE parsed maps are kept, oldest dropped first.
+"""
+
+from collections import OrderedDict
+from typing import Iterable, Optional, TYPE_CHECKING
+from constants import MAP_PRELOAD_CACHE_SIZE
+from objects.map_objects import Map, MapFiles
+if TYPE_CHECKING:
+    from ultimalike import GameEngine
+
+class MapPreloader:
+    def __init__(self, engine: 'GameEngine'):
+        self.engine = engine
+        self.cache: OrderedDict[str, MapFiles] = OrderedDict()
+        self.size = MAP_PRELOAD_CACHE_SIZE
+        self.followed: Optional[Map] = None#The map whose neighbours were queued last
+
+    def follow(self, game_map: Optional[Map]):
+        """Queue game_map's neighbours, unless they were queued when it last became current"""
+        if game_map is self.followed:
+            return
+        self.followed = game_map
+        if game_map:
+            self.preload(game_map.get_adjacent_map_names() | game_map.get_teleporter_target_names())
+
+    def preload(self, map_names: Iterable[str]):
+        for map_name in sorted(map_names):
+            label = f"map {map_name}"
+            if map_name in self.cache:
+                self.cache.move_to_end(map_name)
+                continue
+            #maps.keys() only has maps that are built; deferred ones still read their files.
+            #Combat maps are built afresh every fight (see handle_teleporter).
+            if label in self.engine.assets.pending or (map_name in self.engine.maps.keys() and "combat" not in map_name):
+                continue
+            tile_db = self.engine.tile_db
+            base_layer = tile_db.base_layers.get(map_name)#Looked up here, as base_layers isn't safe to use from the pool
+            self.engine.assets.submit(label, lambda map_name=map_name, base_layer=base_layer: Map.parse_files(map_name, tile_db, base_layer), self.store)
+
+    def store(self, files: MapFiles):
+        self.cache[files.name] = files
+        self.cache.move_to_end(files.name)
+        while len(self.cache) > self.size:
+            self.cache.popitem(last=False)
+
+    def take(self, map_name: str) -> Optional[MapFiles]:
+        """map_name's parsed files, waiting on them if they're still being read. None if it wasn't preloaded."""
+        self.engine.assets.wait(f"map {map_name}")
+        return self.cache.pop(map_name, None)
@@ -0,0 +1,151 @@
+"""
+Memory telemetry.
+
+While enabled, a background thread samples the process RSS, and checkpoints taken at state
+transitions (map loads, entering/leaving combat, saving and loading) record the retained
+size of the engine's long-lived caches plus, when tracemalloc is on, which files allocated
+the most since the previous checkpoint.
+"""
+
+import sys
+import time
+import threading
+import tracemalloc
+from collections import deque
+from types import ModuleType, FunctionType, MethodType, BuiltinFunctionType
+from typing import Dict, List, Tuple, TYPE_CHECKING
+import pygame
+try:
+    import psutil
+except ImportError:
+    psutil = None
+if TYPE_CHECKING:
+    from ultimalike import GameEngine
+
+_NOT_RETAINED = (type, ModuleType, FunctionType, MethodType, BuiltinFunctionType)
+
+def retained_size(root, stop_ids: set[int] = frozenset()) -> int:
+    """
+    Rough bytes held by root and everything it references, counting each object once.
+    Surfaces count their pixel buffers (subsurfaces share their parent's), and objects
+    whose id is in stop_ids (like the engine every Node points back to) are not walked into.
+    """
+    seen = set(stop_ids)
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _NOT_RETAINED):
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, pygame.Surface):
+            if obj.get_parent() is None:
+                total += obj.get_width() * obj.get_height() * obj.get_bytesize()
+            continue
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, "__dict__"):
+                stack.append(vars(obj))
+            #Each class only lists its own __slots__ (a slotted NPC's are ()), so walk the whole MRO
+            for cls in type(obj).__mro__:
+                slots = cls.__dict__.get("__slots__", ())
+                for slot in ((slots,) if isinstance(slots, str) else slots):
+                    if slot not in ("__weakref__", "__dict__") and hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return total
+
+class MemoryMonitor:
+    def __init__(self, engine: 'GameEngine', interval: float = 1.0, max_samples: int = 3600):
+        self.engine = engine
+        self.interval = interval
+        self.enabled = False
+        self.samples: deque[Tuple[float, int]] = deque(maxlen=max_samples)#(seconds since start, rss bytes)
+        self.checkpoints: List[dict] = []
+        self.start_time = time.perf_counter()
+        self.last_snapshot: tracemalloc.Snapshot = None
+        self.thread: threading.Thread = None
+        self.stop_event = threading.Event()
+
+    def enable(self, trace_allocations: bool = True):
+        if self.enabled:
+            return
+        self.enabled = True
+        if psutil:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._sample, daemon=True)
+            self.thread.start()
+        else:
+            print("psutil isn't installed; RSS won't be sampled")
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.checkpoint("telemetry on")
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.checkpoint("telemetry off")
+        self.enabled = False
+        self.stop_event.set()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.last_snapshot = None
+
+    def toggle(self) -> bool:
+        self.disable() if self.enabled else self.enable()
+        return self.enabled
+
+    def _sample(self):
+        process = psutil.Process()
+        while not self.stop_event.is_set():
+            self.samples.append((time.perf_counter() - self.start_time, process.memory_info().rss))
+            self.stop_event.wait(self.interval)
+
+    def current_rss(self) -> int:
+        return self.samples[-1][1] if self.samples else 0
+
+    def subsystem_sizes(self) -> Dict[str, int]:
+        engine = self.engine
+        stop_ids = {id(engine)}
+        return {
+            "maps" : retained_size(dict(engine.maps), stop_ids) + retained_size(engine.maps.deferred, stop_ids),
+            "sprite_db.color_variants" : retained_size(engine.sprite_db.color_variants, stop_ids),
+            "text_cache" : retained_size(engine.renderer.text_cache, stop_ids),
+            "turn_history" : retained_size(engine.schedule_manager.turn_history, stop_ids),
+            "_merge_cache" : retained_size(engine.dialog_manager._merge_cache, stop_ids)
+        }
+
+    def checkpoint(self, label: str):
+        """Record memory at a state transition. Does nothing unless telemetry is enabled."""
+        if not self.enabled:
+            return
+        checkpoint = {"label" : label, "time" : time.perf_counter() - self.start_time, "sizes" : self.subsystem_sizes()}
+        if psutil:
+            checkpoint["rss"] = psutil.Process().memory_info().rss
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            checkpoint["traced"] = tracemalloc.get_traced_memory()[0]
+            if self.last_snapshot:
+                top = snapshot.compare_to(self.last_snapshot, "filename")[:5]
+                checkpoint["top_growth"] = [(str(stat.traceback), stat.size_diff) for stat in top]
+            self.last_snapshot = snapshot
+        self.checkpoints.append(checkpoint)
+
+    def report(self):
+        if self.samples:
+            rss = [sample[1] for sample in self.samples]
+            print(f"RSS now {rss[-1]/2**20:.1f} MiB, min {min(rss)/2**20:.1f} MiB, max {max(rss)/2**20:.1f} MiB over {len(rss)} samples")
+        for checkpoint in self.checkpoints:
+            line = f"[{checkpoint['time']:8.1f}s] {checkpoint['label']:<28}"
+            if "rss" in checkpoint:
+                line += f" rss {checkpoint['rss']/2**20:7.1f} MiB"
+            if "traced" in checkpoint:
+                line += f" traced {checkpoint['traced']/2**20:7.1f} MiB"
+            print(line)
+            print("    " + ", ".join(f"{name} {size/1024:.0f} KiB" for name, size in checkpoint["sizes"].items()))
+            for where, size_diff in checkpoint.get("top_growth", []):
+                print(f"    {size_diff/1024:+9.1f} KiB  {where}")
@@ -105,13 +105,16 @@ class Character(CombatStatsMixin, Node):
                         evalue = -evalue
                     self.engine.sprite_db.get_sprite(self, new_row = evalue, is_delta = is_delta)
 
+    def is_animating(self) -> bool:
+        return self.body_status_ex == ExternalBodyStatus.ON_FIRE or super().is_animating()#Standing while on fire means about to burn
+
     def update(self, **args):
         super().update(**args)
         timer_manager = self.engine.event_manager.timer_manager
         match self.state:
             case ObjectState.STAND:
                 if self.body_status_ex == ExternalBodyStatus.ON_FIRE:
-                    self.state = ObjectState.BURNING
+                    self.set_state(ObjectState.BURNING)
                 else:
                     self.engine.sprite_db.get_sprite(self, new_col = 0)
             case ObjectState.TALK:
@@ -119,9 +122,9 @@ class Character(CombatStatsMixin, Node):
             case ObjectState.BURNING:
                 if self.body_status_ex != ExternalBodyStatus.ON_FIRE:
                     if self.hp > 0:
-                        self.state = ObjectState.STAND
+                        self.set_state(ObjectState.STAND)
                     else:
-                        self.state = ObjectState.DEATH
+                        self.set_state(ObjectState.DEATH)
                 else:
                     num_frames = 2
                     frame_rule = 42
@@ -138,18 +141,18 @@ class Character(CombatStatsMixin, Node):
                 if frame >= num_frames:
                     if self.hp > 0:
                         if self.body_status_ex == ExternalBodyStatus.ON_FIRE:
-                            self.state = ObjectState.BURNING
+                            self.set_state(ObjectState.BURNING)
                         else:
-                            self.state = ObjectState.STAND
+                            self.set_state(ObjectState.STAND)
                     else:
-                        self.state = ObjectState.DEATH
+                        self.set_state(ObjectState.DEATH)
                 else:
                     self.engine.sprite_db.get_sprite(self, new_col = 4)
             case ObjectState.WALK:
                 num_frames = 1
                 frame = int(num_frames*timer_manager.get_progress(f"player_move"))
                 if frame >= num_frames:
-                    self.state = ObjectState.STAND
+                    self.set_state(ObjectState.STAND)
                 else:
                     self.engine.sprite_db.get_sprite(self, new_col = self.engine.step_tracker + 1)
     
@@ -417,7 +420,7 @@ class Party:
         new_pos = leader.add_tuples(leader.position, direc)
         if game_map.is_passable(new_pos, leader.position):
             # Update party positions for following behavior
-            leader.state = ObjectState.WALK
+            leader.set_state(ObjectState.WALK)
             self.last_move_direction = direc
             self.engine.step_tracker = 1 - self.engine.step_tracker
             if not self.engine.event_manager.timer_manager.is_active("player_move"):
@@ -429,7 +432,7 @@ class Party:
             if tile_sound in self.engine.sound_manager.sound:
                 self.engine.sound_manager.sound[tile_sound].play()
             leader.old_position = leader.position
-            leader.position = new_pos
+            leader.set_position(new_pos)
             movement_penalty = DEFAULT_MOVEMENT_PENALTY
             if game_map.name == "overworld":
                 movement_penalty = DEFAULT_OVERWORLD_MOVEMENT_PENALTY
@@ -468,7 +471,7 @@ class Party:
                 return False, 0
         pos = new_map_instructions.get("position", None)
         if pos:
-            leader.position = ast.literal_eval(pos)
+            leader.set_position(ast.literal_eval(pos))
         offset = new_map_instructions.get("offset", None)
         if "offset" in new_map_instructions:
             print(self.last_move_direction, Direction(self.last_move_direction))
@@ -484,11 +487,11 @@ class Party:
             new_pos = leader.add_tuples(new_pos, ast.literal_eval(offset))
             if not self.engine.maps[new_map].is_passable(new_pos):
                 return False, 0
-            leader.position = new_pos
+            leader.set_position(new_pos)
         if pos or offset:
             print(leader.position)
             for i in self.members:
-                self.engine.current_map.objects.remove(i)
+                self.engine.current_map.remove_object(i)
             self.engine.current_map = self.engine.maps[new_map]
             self.current_map = new_map
             for i in self.members:
@@ -513,7 +516,7 @@ class Party:
         """Get the position for a specific party member"""
         if member_index < len(self.members):
             self.members[member_index].old_position = self.members[member_index].position
-            self.members[member_index].position = pos
+            self.members[member_index].set_position(pos)
             
         
     def add_item(self, item: Item):
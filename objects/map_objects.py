@@ -2,11 +2,10 @@ import os
 from dataclasses import dataclass, asdict, fields, MISSING
 import random
 import json
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
-from tiles.tiles import Tile
+from typing import List, Dict, Any, Optional, Callable, TYPE_CHECKING
+from tiles.tiles import Tile, TileLayer
 from tiles.tile_database import TileDatabase
 from constants import *
-import copy
 from objects.characters import Character
 from objects.object_templates import Node, Monster, MapObject, Teleporter, Chest, NPC, ItemHolder, NODE_REGISTRY
 from objects.object_basics import BedBasic, BedRoyal, DoorBasic
@@ -34,6 +33,15 @@ class MapObjectDatabase:
             return cls_instance
         return None
 
+@dataclass
+class MapFiles:
+    """What Map.parse_files read from a map's folder, ready for Map.load_from_files to build on"""
+    name: str
+    width: int
+    height: int
+    base_layer: TileLayer
+    objects_data: Optional[dict]#The objs file, None if the map has none
+
 class Map:
     def __init__(self, width: int, height: int, engine: 'GameEngine', name: str = ""):
         self.width = width
@@ -41,37 +49,53 @@ class Map:
         self.name = name
         self.generation = 0
         self.engine = engine
-        self.tiles = [[None for _ in range(width)] for _ in range(height)]
-        self.tiles_default = [[None for _ in range(width)] for _ in range(height)]
+        self.base_layer = TileLayer(((None,) * width,) * height)
+        self.tile_overlay: Dict[tuple[int, int], Tile] = {}#Tiles set over base_layer since the map was built; saves don't keep them
         self.objects: List[Node] = []
-        self.objects_by_layer: dict[int, list[Node]] = {}
+        #Indexes kept up to date by add_object and remove_object. objects_by_type holds, for every
+        #class get_objects_subset has been asked about, the map's instances of it in self.objects order.
+        #objects_by_position files every object under the tile it stands on (Node.set_position calls
+        #move_object when one moves), and updating_objects are those whose class overrides update:
+        #a class that never needs per-step work opts out by leaving Node.update alone.
+        self.objects_by_name: dict[str, Node] = {}
+        self.objects_by_type: dict[type, list[Node]] = {}
+        self.objects_by_position: dict[tuple[int, int], list[Node]] = {}
+        self.updating_objects: List[Node] = []
         self.groups: dict[str, NodeGroup] = {}
         self.adjacent_maps: Dict[str, str] = {}
         self.enemy_positions = {}
+        self.dirty = True#Set whenever this map may differ from what was last written to a save
+        self.changes = 0#Bumped whenever its objects or tiles change, so the renderer knows to redraw it
+        self.pristine: Optional[Dict[str, str]] = None#object name -> json of its to_dict as built from objs_*.json; None if built from a full save dump
         
     def get_tile_lower(self, pos: tuple[int, int]) -> Optional[Tile]:
         x, y = pos
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.tiles[y][x]
+            if self.tile_overlay:
+                tile = self.tile_overlay.get((x, y))
+                if tile:
+                    return tile
+            return self.base_layer.rows[y][x]
         return False  # Default impassable boundary
         
-    def set_tile(self, pos: tuple[int, int], tile: Tile, and_default: bool = False):
+    def set_tile(self, pos: tuple[int, int], tile: Tile):
         x, y = pos
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.tiles[y][x] = tile
-            if and_default:
-                self.tiles_default[y][x] = tile
+            self.tile_overlay[(x, y)] = tile
+            self.changes += 1
     
-    def set_tile_by_name(self, pos: tuple[int, int], tile_name: str, tile_db: TileDatabase, and_default: bool = False):
+    def set_tile_by_name(self, pos: tuple[int, int], tile_name: str, tile_db: TileDatabase):
         tile = tile_db.get_tile(tile_name)
         if tile:
-            self.set_tile(pos, tile, and_default)
+            self.set_tile(pos, tile)
     
     def revert_tile(self, pos: tuple[int, int]):
-        self.set_tile(pos, copy.deepcopy(self.tiles_default[pos[1]][pos[0]]))
+        self.tile_overlay.pop(tuple(pos), None)
+        self.changes += 1
 
     def revert_map_tiles(self):
-        self.tiles = copy.deepcopy(self.tiles_default)
+        self.tile_overlay.clear()
+        self.changes += 1
             
     def is_passable(self, pos: tuple[int, int], old_tile: Tile | tuple[int, int] = None) -> bool:
         tile = self.get_tile_lower(pos)
@@ -96,24 +120,42 @@ class Map:
         return [obj for obj in self.objects if obj.position == pos  and obj.__is__(subtype)]
     
     def get_objects_subset(self, subtype_wanted: Node = MapObject, obj_list: List[Node] = []):
-        if not obj_list:
-            obj_list = self.objects
-        return [obj for obj in obj_list if obj.__is__(subtype_wanted)]
+        if obj_list:
+            return [obj for obj in obj_list if obj.__is__(subtype_wanted)]
+        if subtype_wanted not in self.objects_by_type:
+            self.objects_by_type[subtype_wanted] = [obj for obj in self.objects if obj.__is__(subtype_wanted)]
+        return list(self.objects_by_type[subtype_wanted])#A copy, since callers often remove objects while looping
     
     def get_object_by_name(self, name: str) -> Node:
-        for obj in self.objects:
-            if obj.name == name:
-                return obj
+        return self.objects_by_name.get(name)
+    
+    def get_objects_in_rect(self, left: int, top: int, right: int, bottom: int) -> List[List[Node]]:
+        """
+        The objects on tiles left..right and top..bottom (inclusive), one list per layer in drawing order:
+        layers in ascending order, and within a layer row by row, then in the order objects arrived on their tile
+        """
+        by_layer: dict[int, list[Node]] = {}
+        objects_by_position = self.objects_by_position
+        for y in range(top, bottom + 1):
+            for x in range(left, right + 1):
+                here = objects_by_position.get((x, y))
+                if here:
+                    for obj in here:
+                        if obj.layer in by_layer:
+                            by_layer[obj.layer].append(obj)
+                        else:
+                            by_layer[obj.layer] = [obj]
+        return [by_layer[layer] for layer in sorted(by_layer)]
     
     def can_pass_objects_at(self, pos: tuple[int, int]) -> bool:
-        objs = self.get_objects_at(pos)
+        objs = self.objects_by_position.get(pos, ())
         for obj in objs:
             if not obj.is_passable:
                 return False
         return True
     
     def can_see_thru_objects_at(self, pos: tuple[int, int]) -> bool:
-        objs = self.get_objects_at(pos)
+        objs = self.objects_by_position.get(pos, ())
         for obj in objs:
             if not obj.can_see_thru:
                 return False
@@ -121,9 +163,13 @@ class Map:
     
     def add_object(self, map_object: Node):
         self.objects.append(map_object)
-        if map_object.layer not in self.objects_by_layer:
-            self.objects_by_layer[map_object.layer] = []
-        self.objects_by_layer[map_object.layer].append(map_object)
+        self.objects_by_name.setdefault(map_object.name, map_object)#The first object added under a name wins, as in a linear search
+        for subtype, subset in self.objects_by_type.items():
+            if map_object.__is__(subtype):
+                subset.append(map_object)
+        self.objects_by_position.setdefault(map_object.position, []).append(map_object)
+        if type(map_object).update is not Node.update:
+            self.updating_objects.append(map_object)
         if map_object.group_name:
             if map_object.group_name not in self.groups:
                 self.groups[map_object.group_name] = NodeGroup(map_object)
@@ -132,22 +178,69 @@ class Map:
             map_object.group = self.groups[map_object.group_name]
             
         map_object.map = self
+        self.dirty = True
+        self.changes += 1
     
     def remove_object(self, map_object: Node):
         if map_object in self.objects:
             self.objects.remove(map_object)
-            self.objects_by_layer[map_object.layer].remove(map_object)
+            if not self._unfile(map_object, map_object.position):#It moved while its map attribute pointed at another map
+                for position in list(self.objects_by_position):
+                    if self._unfile(map_object, position):
+                        break
+            for i, obj in enumerate(self.updating_objects):
+                if obj is map_object:
+                    del self.updating_objects[i]
+                    break
+            if self.objects_by_name.get(map_object.name) is map_object:
+                del self.objects_by_name[map_object.name]
+                namesake = next((obj for obj in self.objects if obj.name == map_object.name), None)
+                if namesake:
+                    self.objects_by_name[map_object.name] = namesake
+            for subtype, subset in self.objects_by_type.items():
+                if map_object.__is__(subtype):
+                    subset.remove(map_object)
+            self.dirty = True
+            self.changes += 1
     
-    @classmethod
-    def load_from_files(cls, map_name: str, map_obj_db: MapObjectDatabase, tile_db: TileDatabase, engine: 'GameEngine', objects_data: dict = None):
-        """Load map from ASCII file and JSON mapping file"""
-        print(map_name)
+    def move_object(self, map_object: Node, new_position: tuple[int, int]):
+        """File map_object under the tile it is moving to. Node.set_position calls this before the position changes."""
+        if self._unfile(map_object, map_object.position):
+            self.objects_by_position.setdefault(new_position, []).append(map_object)
+            self.dirty = True
+            self.changes += 1
+    
+    def _unfile(self, map_object: Node, position: tuple[int, int]) -> bool:
+        """Take map_object out of objects_by_position[position], if it's there"""
+        here = self.objects_by_position.get(position, ())
+        for i, obj in enumerate(here):
+            if obj is map_object:#Not ==, which compares every dataclass field
+                del here[i]
+                if not here:
+                    del self.objects_by_position[position]
+                return True
+        return False
+    
+    @staticmethod
+    def parse_files(map_name: str, tile_db: TileDatabase, base_layer: TileLayer = None) -> 'MapFiles':
+        """
+        Read a map's files and build its tiles, unless base_layer (the map's layer from
+        tile_db.base_layers, looked up by the caller) already has them. Only reads the files and
+        tile_db's tile types, so it's safe to run off the main thread (see MapPreloader).
+        """
         map_folder = os.path.join(MAPS_DIR, map_name)
         map_file = os.path.join(map_folder, f"map_{map_name}.txt")
         mapping_file = os.path.join(map_folder, f"tiles_{map_name}.json")
         objects_file = os.path.join(map_folder, f"objs_{map_name}.json")
         levels_file = os.path.join(map_folder, f"levels_{map_name}.txt")
         
+        objects_data = None
+        if os.path.exists(objects_file):
+            with open(objects_file, 'r') as f:
+                objects_data = json.load(f)
+        if base_layer:
+            return MapFiles(map_name, len(base_layer.rows[0]), len(base_layer.rows), base_layer, objects_data)
+
         if not os.path.exists(map_file):
             raise FileNotFoundError(f"Map file not found: {map_file}")
         
@@ -172,34 +265,180 @@ class Map:
             
         height = len(lines)
         width = max(len(line) for line in lines) if lines else 0
-        game_map = cls(width, height, engine, map_name)
+        tiles = [[None for _ in range(width)] for _ in range(height)]
         # Parse tiles using the mapping
         for y, line in enumerate(lines):
             for x, char in enumerate(line):
-                pos = (x, y)
                 if char in char_to_tile:
-                    tile_name = char_to_tile[char]
-                    game_map.set_tile_by_name(pos, tile_name, tile_db, True)
-                    game_map.tiles[y][x].level = 1 if not tile_levels else int(tile_levels[y][x])
+                    tile = tile_db.get_tile(char_to_tile[char])
+                    if tile:
+                        tile.level = 1 if not tile_levels else int(tile_levels[y][x])
                 else:
                     # Default to grass if character not found in mapping
-                    game_map.set_tile_by_name(pos, "grass", tile_db, True)
+                    tile = tile_db.get_tile("grass")
+                tiles[y][x] = tile
+        base_layer = TileLayer(tuple(tuple(row) for row in tiles))
+        return MapFiles(map_name, width, height, base_layer, objects_data)
+
+    @classmethod
+    def load_from_files(cls, map_name: str, map_obj_db: MapObjectDatabase, tile_db: TileDatabase, engine: 'GameEngine', objects_data: dict = None, objects_delta: dict = None, files: 'MapFiles' = None):
+        """
+        Load map from ASCII file and JSON mapping file.
+        objects_data replaces the objects file outright (old full saves), while objects_delta
+        is applied on top of it (see to_delta). files is parse_files' result, if it was already read.
+        """
+        print(map_name)
+        if files is None:
+            files = cls.parse_files(map_name, tile_db, tile_db.base_layers.get(map_name))
+        game_map = cls(files.width, files.height, engine, map_name)
+        #Registered here rather than in parse_files, so only the main thread touches base_layers
+        game_map.base_layer = tile_db.base_layers.setdefault(map_name, files.base_layer)
 
         # Load objects if file exists
-        if os.path.exists(objects_file):
-            with open(objects_file, 'r') as f:
-                if not objects_data:
-                    objects_data = json.load(f)
+        if files.objects_data is not None:
+            if not objects_data:
+                objects_data = files.objects_data
+                game_map.pristine = {}
+            objects_delta = objects_delta or {}
+            changed = objects_delta.get("changed", {})
+            removed = set(objects_delta.get("removed", []))
             for obj_name, obj_data in objects_data.items():
                 if obj_name == "adjacent_maps":
                     for dir, map in obj_data["args"].items():
                         game_map.adjacent_maps[dir] = map
+                had_skin_color = "skin_color" in obj_data
                 map_object = map_obj_db.create_obj(obj_name, obj_data["object_type"], obj_data)
+                if game_map.pristine is not None:
+                    game_map.pristine[obj_name] = game_map.snapshot_object(map_object, had_skin_color)
+                    if obj_name in removed:
+                        continue
+                    if obj_name in changed:
+                        obj_data = json.loads(game_map.pristine[obj_name]) | changed[obj_name]
+                        map_object = map_obj_db.create_obj(obj_name, obj_data["object_type"], obj_data)
                 game_map.add_object(map_object)
+            for obj_name, obj_data in objects_delta.get("added", {}).items():
+                game_map.add_object(map_obj_db.create_obj(obj_name, obj_data["object_type"], obj_data))
         return game_map
+
+    @staticmethod
+    def snapshot_object(map_object: Node, had_skin_color: bool = True) -> str:
+        obj_dict = map_object.to_dict()
+        if not had_skin_color and map_object.skin_color != Node.__dataclass_fields__["skin_color"].default:
+            #A randomly rolled skin colour isn't part of the map file, so keep it out of the baseline and it always gets saved
+            obj_dict["skin_color"] = None
+        return json.dumps(obj_dict, separators=(",", ":"))
+    
+    def get_adjacent_map_names(self) -> set[str]:
+        """Names of the maps the player can walk to straight off the edges of this one"""
+        names = set()
+        for adjacent in self.adjacent_maps.values():
+            if type(adjacent) == dict and "target_map" in adjacent:
+                names.add(adjacent["target_map"])
+        edge_teleporter = self.get_object_by_name("map_edge_teleporter")
+        if edge_teleporter:
+            for adjacent in edge_teleporter.args.get("adjacent_maps", {}).values():
+                for instructions in (adjacent if type(adjacent) == list else [adjacent]):
+                    names.add(instructions["map"])
+        return names
+    
+    def get_teleporter_target_names(self) -> set[str]:
+        """Names of the maps this one's teleporters lead to"""
+        return {teleporter.args["target_map"] for teleporter in self.get_objects_subset(Teleporter) if teleporter.args.get("target_map")}
     
     def in_map_range(self, pos: tuple[int, int]):
         return pos[0] in range(self.width) and pos[1] in range(self.height)
     
     def to_dict(self):
-        return {obj.name : obj.to_dict() for obj in self.objects if not obj.__is__(Character)}
\ No newline at end of file
+        return {obj.name : obj.to_dict() for obj in self.objects if not obj.__is__(Character)}
+
+    def to_delta(self) -> dict:
+        """
+        What changed since the map was built from its objs file: the changed fields of existing
+        objects, whole spawned objects and the names of removed ones. Needs self.pristine.
+        """
+        changed, added, present = {}, {}, set()
+        for obj in self.objects:
+            if obj.__is__(Character):
+                continue
+            present.add(obj.name)
+            pristine = self.pristine.get(obj.name)
+            if pristine is None:
+                added[obj.name] = obj.to_dict()
+                continue
+            current = self.snapshot_object(obj)
+            if current == pristine:
+                continue
+            current, pristine = json.loads(current), json.loads(pristine)
+            diff = {key : value for key, value in current.items() if key not in pristine or pristine[key] != value}
+            if diff:
+                changed[obj.name] = diff
+        delta = {}
+        if changed:
+            delta["changed"] = changed
+        if added:
+            delta["added"] = added
+        removed = [obj_name for obj_name in self.pristine if obj_name not in present]
+        if removed:
+            delta["removed"] = removed
+        return delta
+
+class MapCollection(dict):
+    """
+    GameEngine.maps. Behaves like a dict of map name -> Map, except that maps restored from a save
+    can be left deferred, holding just their saved record. A deferred map counts as present for
+    `in` and is built by the loader the first time it's looked up.
+    Iterating (keys, items, values, len) only covers maps that have actually been built.
+    When more than limit maps are built, visit hands the least recently visited ones to packer,
+    which encodes them as records, and defers them again (limit 0 keeps every map built).
+    """
+    def __init__(self, loader: Callable[[str, Any], Any] = None, packer: Callable[[str, Map], Any] = None, limit: int = MAP_RESIDENCY_LIMIT):
+        super().__init__()
+        self.loader = loader
+        self.packer = packer
+        self.limit = limit
+        self.deferred: Dict[str, Any] = {}
+        self.recent: Dict[str, None] = {}#Names of built maps, least recently visited first
+
+    def defer(self, map_name: str, record: Any):
+        dict.pop(self, map_name, None)
+        self.recent.pop(map_name, None)
+        self.deferred[map_name] = record
+
+    def visit(self, map_name: str):
+        """The party is now on map_name. Packs away the least recently visited maps over the limit."""
+        if dict.__contains__(self, map_name):
+            self.recent.pop(map_name, None)
+            self.recent[map_name] = None
+        if not self.limit or not self.packer:
+            return
+        for name in list(self.recent):
+            if dict.__len__(self) <= self.limit:
+                break
+            if name != map_name:
+                self.defer(name, self.packer(name, dict.__getitem__(self, name)))
+
+    def __contains__(self, map_name):
+        return dict.__contains__(self, map_name) or map_name in self.deferred
+
+    def __missing__(self, map_name):
+        if map_name not in self.deferred:
+            raise KeyError(map_name)
+        #The record stays deferred until the loader has built the map (__setitem__ drops it), so a failed build doesn't lose it
+        self.loader(map_name, self.deferred[map_name])
+        if not dict.__contains__(self, map_name):
+            raise KeyError(f"Could not build map {map_name} from its saved record")
+        return dict.__getitem__(self, map_name)
+
+    def __setitem__(self, map_name, game_map: Map):
+        self.deferred.pop(map_name, None)
+        self.recent.pop(map_name, None)
+        self.recent[map_name] = None
+        super().__setitem__(map_name, game_map)
+
+    def get(self, map_name, default=None):
+        return self[map_name] if map_name in self else default
+
+    def clear(self):
+        self.deferred.clear()
+        self.recent.clear()
+        super().clear()
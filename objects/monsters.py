@@ -39,7 +39,7 @@ class MonsterKesveltAlleyThief(Monster):
             objects_at_new_pos = self.map.get_objects_at(new_pos, subtype=Monster)
             if not objects_at_new_pos:
                 self.old_position = self.position
-                self.position = new_pos
+                self.set_position(new_pos)
                 self.last_move_direction = Direction(direc)
                 return
             for obj in objects_at_new_pos:
@@ -49,11 +49,11 @@ class MonsterKesveltAlleyThief(Monster):
                     self.engine.combat_manager.append_to_combat_log(f"{self.name} attacked {obj.name} because {obj.pronoun} was between {self.prepositional} and {self.current_target.name}")
                     if obj.hp <= 0:
                         self.old_position = self.position
-                        self.position = new_pos
+                        self.set_position(new_pos)
                         self.last_move_direction = Direction(direc)
                     return
             self.old_position = self.position
-            self.position = new_pos
+            self.set_position(new_pos)
             self.last_move_direction = Direction(direc)
             return
         else:
@@ -63,7 +63,7 @@ class MonsterKesveltAlleyThief(Monster):
             objects_at_new_pos = self.map.get_objects_at(new_pos, subtype=Monster)
             if not objects_at_new_pos:
                 self.old_position = self.position
-                self.position = new_pos
+                self.set_position(new_pos)
                 self.last_move_direction = Direction(direc_choice)
                 return
             direc_choices.remove(direc_choice)
@@ -72,7 +72,7 @@ class MonsterKesveltAlleyThief(Monster):
             objects_at_new_pos = self.map.get_objects_at(new_pos, subtype=Monster)
             if not objects_at_new_pos:
                 self.old_position = self.position
-                self.position = new_pos
+                self.set_position(new_pos)
                 self.last_move_direction = Direction(direc_choice)
                 return
             for obj in objects_at_new_pos:
@@ -81,11 +81,11 @@ class MonsterKesveltAlleyThief(Monster):
                     self.engine.combat_manager.append_to_combat_log(f"{self.name} attacked {obj.name} because {obj.pronoun} was between {self.prepositional} and {self.current_target.name}")
                     if obj.hp <= 0:
                         self.old_position = self.position
-                        self.position = new_pos
+                        self.set_position(new_pos)
                         self.last_move_direction = Direction(direc_choice)
                 else:
                     self.old_position = self.position
-                    self.position = new_pos
+                    self.set_position(new_pos)
                     self.last_move_direction = Direction(direc_choice)
                 return
     @staticmethod
@@ -116,7 +116,7 @@ class MonsterGuardRookie(Monster):
             new_pos = self.add_tuples(self.position, (dx, 0))
             if self.map.is_passable(new_pos):
                 self.old_position = self.position
-                self.position = new_pos
+                self.set_position(new_pos)
                 self.last_move_direction = Direction((dx, 0))
         
         # 3. If in same column, move toward target's row
@@ -124,7 +124,7 @@ class MonsterGuardRookie(Monster):
             new_pos = self.add_tuples(self.position, (0, dy))
             if self.map.is_passable(new_pos):
                 self.old_position = self.position
-                self.position = new_pos
+                self.set_position(new_pos)
                 self.last_move_direction = Direction((0, dy))
         
         # 4. If we reach here, we couldn't move - skip turn
@@ -190,25 +190,25 @@ class Slime(Spawner, Monster):
         match self.state:
             case ObjectState.STAND:#Idle animation
                 num_frames = 1
-                frame = (pygame.time.get_ticks() // 200) % num_frames
+                frame = (timer_manager.now() // 200) % num_frames
                 self.engine.sprite_db.get_sprite(self, new_col = frame)
                 pass
             case ObjectState.WALK:
                 pass
             case ObjectState.DYING:
                 if self.engine.event_manager.timer_manager.get_progress(f"{self.name}_dying") >= 1.0:
-                    self.state = ObjectState.DEATH
+                    self.set_state(ObjectState.DEATH)
             case ObjectState.DEATH:
                 pass
             case ObjectState.ATTACKED:
-                self.state = self.after_state
+                self.set_state(self.after_state)
             case ObjectState.ATTACHING:
                 num_frames = 3
                 frame = int(num_frames*timer_manager.get_progress(f"enemy_move"))
                 if frame >= num_frames:
                     self.engine.sprite_db.get_sprite(self, 0, 0)
-                    self.state = self.after_state
-                    self.state = ObjectState.ATTACHED
+                    self.set_state(self.after_state)
+                    self.set_state(ObjectState.ATTACHED)
                     self.after_state = ObjectState.ATTACHED
                 else:
                     self.engine.sprite_db.get_sprite(self, new_col = 2 + frame)
@@ -216,13 +216,13 @@ class Slime(Spawner, Monster):
             case ObjectState.ATTACHED:
                 if self.attached_to and False:
                     self.old_position = self.attached_to.old_position
-                    self.position = self.attached_to.position
+                    self.set_position(self.attached_to.position)
             case ObjectState.ATTACK_MELEE:
                 num_frames = 3
                 frame = int(num_frames*timer_manager.get_progress(f"enemy_move"))
                 if frame >= num_frames:
                     self.engine.sprite_db.get_sprite(self, 0, 0)
-                    self.state = self.after_state
+                    self.set_state(self.after_state)
                 else:
                     self.engine.sprite_db.get_sprite(self, new_col = 2 + frame)
             case ObjectState.SLIME_SPLIT:
@@ -230,7 +230,7 @@ class Slime(Spawner, Monster):
                 frame = int(num_frames*timer_manager.get_progress(f"{self.name}_split"))
                 if frame >= num_frames:
                     self.engine.sprite_db.get_sprite(self, 0, 0)
-                    self.state = self.after_state
+                    self.set_state(self.after_state)
                 else:
                     self.engine.sprite_db.get_sprite(self, new_col = frame)
         
@@ -251,9 +251,9 @@ class Slime(Spawner, Monster):
             self.attached_to = target
             self.current_target = target
             self.old_position = self.position
-            self.position = target.position
+            self.set_position(target.position)
             target.parasite_ex = self
-            self.state = ObjectState.ATTACHING
+            self.set_state(ObjectState.ATTACHING)
             target.body_status_ex = ExternalBodyStatus.PARASITE
             
     def attacked(self, attacker: CombatStatsMixin, damage: int = 0):
@@ -272,20 +272,20 @@ class Slime(Spawner, Monster):
             self.color = RED
             self.engine.event_manager.timer_manager.start_timer(f"{self.name}_dying", 500)
             self.engine.combat_manager.append_to_combat_log(f"{self.name} died")
-            self.state = ObjectState.DYING
+            self.set_state(ObjectState.DYING)
             return
-        self.state = ObjectState.ATTACKED
+        self.set_state(ObjectState.ATTACKED)
         half_hp = self.hp // 2
         if half_hp <= 0:
             return
         new_slime = self.spawn_object_at_position("slime", "", self.add_tuples(self.position, (1, 0)))
         self.hp = half_hp
         self.args["spritesheet"][1] = 1
-        self.state = ObjectState.SLIME_SPLIT
+        self.set_state(ObjectState.SLIME_SPLIT)
         new_slime.hp = half_hp
         new_slime.current_target = attacker
         new_slime.args["spritesheet"][1] = 2
-        new_slime.state = ObjectState.SLIME_SPLIT
+        new_slime.set_state(ObjectState.SLIME_SPLIT)
         self.engine.event_manager.timer_manager.start_timer(f"{self.name}_split", 400)
         self.engine.event_manager.timer_manager.start_timer(f"{new_slime.name}_split", 400)
                 
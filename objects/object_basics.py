@@ -78,7 +78,7 @@ class NPCCrossbower(ArrowSpawner):
                     if arrow.__is__(Missile):
                         shooting_direction = action.direction
                         arrow.move_direction = shooting_direction
-                        arrow.state = ObjectState.KEEP_MOVING
+                        arrow.set_state(ObjectState.KEEP_MOVING)
                         arrow.move_interval = 0.25
                         if arrow.image:
                             match shooting_direction:
@@ -170,6 +170,8 @@ class AnimatedObject(MapObject):
         cls.current_col = cls.min_col
         cls.current_row = cls.min_row
         return cls
+    def is_animating(self) -> bool:
+        return self.frames_since_last_change >= 0 or super().is_animating()
     def update(self, **args):
         super().update(**args)
         if self.frames_since_last_change < 0:
@@ -17,8 +17,12 @@ def register_node_type(name: str):
         NODE_REGISTRY[name] = cls
         return cls
     return decorator
+#Node, MapObject and NPC are slotted: maps hold thousands of them (patrol, spawn and landing
+#nodes especially), and slots keep each instance small and its fields quick to read.
+#Subclasses that aren't slotted themselves get an ordinary __dict__ for their extra state.
+#Slotted dataclasses are rebuilt by the decorator, so their methods must name the class in super(...).
 @register_node_type("node")
-@dataclass
+@dataclass(slots=True)
 class Node:
     name: str
     args: dict[str, Any] = field(default_factory=lambda: {})
@@ -46,7 +50,7 @@ class Node:
     object_type: str = None
     activate_by_stepping_on = True
     color = RED
-    image = None
+    image: pygame.Surface = None
     fixed_spritesheet_row: int = 0
     node_id = 0
     map: 'Map' = None
@@ -105,12 +109,17 @@ class Node:
     def default_args() -> dict:
         return {}
     
+    #Positions and directions are 2-tuples, so each helper handles those first with plain indexing
+    #(no generator or zip); other lengths and scalar operands fall through to the general form.
     @staticmethod
     def get_sign(num: tuple | int | float) -> tuple | Literal[-1] | Literal[1] | Literal[0]:
         """
         Determines if a number (or tuple of numbers) is positive, negative, or neither.
         """
         if type(num) == tuple:
+            if len(num) == 2:
+                x, y = num
+                return (-1 if x < 0 else (1 if x > 0 else 0), -1 if y < 0 else (1 if y > 0 else 0))
             return tuple(Node.get_sign(n) for n in num)
         else:
             return -1 if num < 0 else (1 if num > 0 else 0)
@@ -119,7 +128,9 @@ class Node:
         """
         Adds two tuples together, or adds the number tuple2 to each element of tuple1
         """
-        if type(tuple2) in [int, float]:
+        if type(tuple2) == tuple and len(tuple1) == 2 == len(tuple2):
+            return (tuple1[0] + tuple2[0], tuple1[1] + tuple2[1])
+        if isinstance(tuple2, (int, float)):
             b = tuple2
             return tuple(a + b for a in tuple1)
         if len(tuple1) != len(tuple2):
@@ -131,7 +142,9 @@ class Node:
         """
         Subtracts two tuples, or subtracts the number tuple2 from each element of tuple1
         """
-        if type(tuple2) in [int, float]:
+        if type(tuple2) == tuple and len(tuple1) == 2 == len(tuple2):
+            return (tuple1[0] - tuple2[0], tuple1[1] - tuple2[1])
+        if isinstance(tuple2, (int, float)):
             b = tuple2
             return tuple(a - b for a in tuple1)
         if len(tuple1) != len(tuple2):
@@ -140,11 +153,15 @@ class Node:
     
     @staticmethod
     def multiply_tuples(tuple1: tuple, tuple2: tuple | int | float) -> tuple:
-        if type(tuple2) in [int, float]:
+        if isinstance(tuple2, (int, float)):
             b = tuple2
+            if len(tuple1) == 2:
+                return (tuple1[0] * b, tuple1[1] * b)
             return tuple(a * b for a in tuple1)
         if len(tuple1) != len(tuple2):
             raise ValueError
+        if len(tuple1) == 2:
+            return (tuple1[0] * tuple2[0], tuple1[1] * tuple2[1])
         return tuple(a * b for a, b in zip(tuple1, tuple2))
     
     def distance(self, obj: 'Node', can_move_diagonally: bool = True) -> tuple[int, tuple[int, int]]:
@@ -153,9 +170,29 @@ class Node:
             return max(abs(diff[0]), abs(diff[1])), diff
         return abs(diff[0]) + abs(diff[1]), diff
     
+    def set_position(self, position: tuple[int, int]):
+        """Move to position. Objects on a map must move through this, so the map's tile index stays right."""
+        if self.map is not None:
+            self.map.move_object(self, position)
+        self.position = position
+
+    def set_state(self, state: ObjectState):
+        """Change state. Saved maps keep their objects' states, so this marks the map as changed."""
+        if self.map is not None:
+            self.map.dirty = True
+        self.state = state
+
     def update(self, **args):
         pass
 
+    def is_animating(self) -> bool:
+        """Whether update changes this object's sprite every frame, not only while a timer runs"""
+        return self.state in ANIMATED_OBJECT_STATES
+
+    def needs_update(self) -> bool:
+        """Whether update still has work to do while this object is off screen: an animation, or a state to move on from"""
+        return self.state != ObjectState.STAND or self.is_animating()
+
     def draw(self):
         pass
 
@@ -174,7 +211,7 @@ class Node:
         
 
 @register_node_type("mapobject")
-@dataclass
+@dataclass(slots=True)
 class MapObject(Node):
     move_interval: float = 0.0
     can_be_attacked = False
@@ -185,18 +222,18 @@ class MapObject(Node):
     max_node: int = -1
     node_id = 1
     look_text: str = None
-    is_hostile = False
+    is_hostile: bool = False
     is_passable: bool = False
     last_move_direction: tuple[int, int] = None
     allies_in_combat: List[str] = None
     ally_positions: str = None  # Added to dataclass fields
     
     # Track movement progress for the current action
-    current_action_start_turn = 0
-    moves_completed_this_action = 0
+    current_action_start_turn: int = 0
+    moves_completed_this_action: int = 0
 
     def to_dict(self):
-        my_dict = super().to_dict()
+        my_dict = super(MapObject, self).to_dict()
         my_dict["move_interval"] = self.move_interval
         my_dict["state"] = self.state.value
         if self.look_text:
@@ -218,7 +255,7 @@ class MapObject(Node):
         status = self.engine.schedule_manager.get_npc_schedule_status(self.name, self.move_interval)
         
         if not status['current_event']:
-            self.state = ObjectState.STAND
+            self.set_state(ObjectState.STAND)
             self.current_target = None
             self.current_event = None
             return
@@ -281,18 +318,18 @@ class MapObject(Node):
                         for obj in self.group.nodes:
                             obj.old_position = obj.position
                             obj.last_move_direction = self.last_move_direction
-                            obj.position = self.add_tuples(obj.position, self.last_move_direction.value)
+                            obj.set_position(self.add_tuples(obj.position, self.last_move_direction.value))
                     self.group.checked_movement = True
             else:
                 new_position = self.add_tuples(me, self.last_move_direction.value)
                 if self.is_passable or self.map.is_passable(new_position):
-                    self.position = new_position
+                    self.set_position(new_position)
             
             # Check if we reached our target
             if self.position == my_target:
                 if self.state == ObjectState.WALK:
                     self.current_target = None
-                    self.state = ObjectState.STAND
+                    self.set_state(ObjectState.STAND)
                 elif self.state == ObjectState.PATROL:
                     self.next_node()
 
@@ -344,7 +381,7 @@ class MapObject(Node):
         self.current_target = self.map.get_object_by_name(target)
         if self.current_target:
             print(f"My target, {self.current_target.name}, does exist. I will walk at them at an interval of {self.move_interval}")
-            self.state = ObjectState.WALK
+            self.set_state(ObjectState.WALK)
             return self.current_target
         return None
 
@@ -359,7 +396,7 @@ class MapObject(Node):
         self.current_target = self.map.get_object_by_name(f"{self.patrol_node_template}_{action.start_node}")
         if self.current_target:
             self.max_node = action.max_node
-            self.state = ObjectState.PATROL
+            self.set_state(ObjectState.PATROL)
         
 
 @register_node_type("chest")
@@ -394,7 +431,7 @@ class ItemHolder(MapObject):
     node_id = 7
 
 @register_node_type("npc")
-@dataclass
+@dataclass(slots=True)
 class NPC(MapObject):
     can_be_attacked = True
     color = BLACK
@@ -402,6 +439,7 @@ class NPC(MapObject):
 
 @register_node_type("teleporter")
 class Teleporter(Node):
+    __slots__ = ()
     color = MAGENTA
     node_id = 4
     
@@ -510,7 +548,7 @@ class CombatStatsMixin:
 
 
     def death(self):
-        self.state = ObjectState.DYING
+        self.set_state(ObjectState.DYING)
     
     def my_battle_tactics(self):
         if self.hp <= 0:
@@ -539,17 +577,17 @@ class Monster(CombatStatsMixin, Node):
             case ObjectState.KNOCKBACK:
                 if self.engine.event_manager.timer_manager.get_progress(f"{self.name}_knockback") >= 1.0:
                     self.old_position = self.position
-                    self.state = self.after_state
+                    self.set_state(self.after_state)
             case ObjectState.COLLISION_KNOCKBACK:
                 self.hp -= 5
-                self.state = ObjectState.STAND if self.hp > 0 else ObjectState.DYING
+                self.set_state(ObjectState.STAND if self.hp > 0 else ObjectState.DYING)
             case ObjectState.COLLISION_STAND:
                 self.hp -=50
-                self.state = ObjectState.STAND if self.hp > 0 else ObjectState.DYING
+                self.set_state(ObjectState.STAND if self.hp > 0 else ObjectState.DYING)
             case ObjectState.DYING:
                 self.is_passable = True
                 self.engine.sprite_db.get_sprite(self, 0, 0)
-                self.state = ObjectState.DEATH
+                self.set_state(ObjectState.DEATH)
             case ObjectState.DEATH:
                 pass
     
@@ -574,11 +612,11 @@ class Monster(CombatStatsMixin, Node):
                 if not self.map.is_passable(new_position):
                     self.after_state = ObjectState.COLLISION_KNOCKBACK
                     break  # Stop if we hit a wall or another unit
-                self.position = new_position
+                self.set_position(new_position)
                 tiles_back += 1
             
             if tiles_back:
-                self.state = ObjectState.KNOCKBACK
+                self.set_state(ObjectState.KNOCKBACK)
                 self.engine.event_manager.timer_manager.start_timer(f"{self.name}_knockback", tiles_back*150)
                 self.engine.combat_manager.walkers.append(self)
                 self.engine.combat_manager.append_to_combat_log(f"{attacker.name} sent {self.name} flying back {tiles_back} spaces!")
@@ -610,7 +648,7 @@ class Missile(MapObject):
                     self.hits_player = True
                 self.destroy_after_use = True
                 self.moves_completed_this_action = expected_moves - 1
-            self.position = new_pos
+            self.set_position(new_pos)
             self.moves_completed_this_action += 1
     def destroy(self):
         if self.hits_player:
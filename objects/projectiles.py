@@ -22,10 +22,10 @@ class BattleProjectile(Node):
         self = super().from_dict(data, engine)
         print(f"Debug: {self.args["delay"]}")
         if self.args["delay"] == 0:
-            self.state = ObjectState.ATTACK_MELEE
+            self.set_state(ObjectState.ATTACK_MELEE)
             self.engine.event_manager.timer_manager.start_timer(f"{self.name}_attack", 1000)
         else:
-            self.state = ObjectState.SLEEP
+            self.set_state(ObjectState.SLEEP)
             self.engine.event_manager.timer_manager.start_timer(f"{self.name}_wakeup", self.args["delay"])
         return self
     def default_args():
@@ -37,7 +37,7 @@ class BattleProjectile(Node):
             case ObjectState.SLEEP:
                 if timer_manager.get_progress(f"{self.name}_wakeup") >= 1.0:
                     print(f"Debug: {self.name} woke up")
-                    self.state = ObjectState.WIGGLE
+                    self.set_state(ObjectState.WIGGLE)
                     timer_manager.start_timer(f"{self.name}_attack", 1000)
             case ObjectState.WIGGLE:
                 num_frames = 7
@@ -45,7 +45,7 @@ class BattleProjectile(Node):
                 if frame >= num_frames:
                     timer_manager.start_timer(f"{self.name}_attack", 125)
                     self.engine.sprite_db.get_sprite(self, 1, 0)
-                    self.state = ObjectState.ATTACK_MELEE
+                    self.set_state(ObjectState.ATTACK_MELEE)
                 else:
                     self.engine.sprite_db.get_sprite(self, new_col = 1 + frame)
             case ObjectState.ATTACK_MELEE:
@@ -57,12 +57,12 @@ class BattleProjectile(Node):
                             obj.hp -= 5
                             obj.attacked(self.master, 5)
                     timer_manager.start_timer(f"{self.name}_dying", 350)
-                    self.state = ObjectState.DYING
+                    self.set_state(ObjectState.DYING)
                 else:
                     self.engine.sprite_db.get_sprite(self, new_col = frame)
             case ObjectState.DYING:
                 if timer_manager.get_progress(f"{self.name}_dying") >= 1.0:
-                    self.state = ObjectState.DEATH
+                    self.set_state(ObjectState.DEATH)
             case ObjectState.DEATH:
                 self.destroy()
 
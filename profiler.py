@@ -0,0 +1,151 @@
+"""
+Frame profiler.
+
+Named spans are recorded into a ring buffer that keeps the last few seconds of frames.
+From that buffer it reports p50/p95/p99 per span name and can export Chrome trace-event
+JSON, which chrome://tracing or https://ui.perfetto.dev can open.
+
+Methods decorated with @profiled are only wrapped with timing code while the profiler is
+enabled, so they cost nothing when it's off. Sections of a function are timed with
+`with profiler.span(name):`, which is a shared no-op context while disabled.
+"""
+
+import os
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+from functools import wraps
+from typing import Callable, Dict, List, Tuple
+from constants import SAVES_DIR
+
+Span = Tuple[str, int, int]#name, start ns, duration ns
+
+_PROFILED_METHODS: List[Tuple[type, str, Callable, str]] = []#class, attribute, undecorated function, span name
+_DISABLED_SPAN = nullcontext()
+
+class _ProfiledMethod:
+    """Placeholder @profiled leaves in a class body; it registers the method and then puts the plain function back"""
+    def __init__(self, func: Callable, label: str):
+        self.func = func
+        self.label = label
+
+    def __set_name__(self, owner: type, name: str):
+        _PROFILED_METHODS.append((owner, name, self.func, self.label or name))
+        setattr(owner, name, self.func)
+
+def profiled(label: str = None):
+    """Mark a method to be timed as a span while the profiler is enabled"""
+    def decorator(func):
+        return _ProfiledMethod(func, label)
+    return decorator
+
+class _Span:
+    __slots__ = ("profiler", "name", "start")
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+class FrameProfiler:
+    def __init__(self, max_frames: int = 600):
+        self.enabled = False
+        self.frames: deque[List[Span]] = deque(maxlen=max_frames)#Ring buffer; the oldest frames fall off the end
+        self.current: List[Span] = []
+        self.frame_start = 0
+
+    def enable(self):
+        if self.enabled:
+            return
+        for owner, name, func, label in _PROFILED_METHODS:
+            setattr(owner, name, self._wrap(func, label))
+        self.enabled = True
+        self.frame_start = time.perf_counter_ns()#Usually enabled mid-frame (debug_inputs), so that frame starts now
+
+    def disable(self):
+        if not self.enabled:
+            return
+        for owner, name, func, label in _PROFILED_METHODS:
+            setattr(owner, name, func)
+        self.enabled = False
+        self.current = []
+
+    def toggle(self) -> bool:
+        self.disable() if self.enabled else self.enable()
+        return self.enabled
+
+    def _wrap(self, func: Callable, label: str) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(label, start, time.perf_counter_ns() - start)
+        return wrapper
+
+    def span(self, name: str):
+        return _Span(self, name) if self.enabled else _DISABLED_SPAN
+
+    def record(self, name: str, start: int, duration: int):
+        self.current.append((name, start, duration))
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.record("frame", self.frame_start, time.perf_counter_ns() - self.frame_start)
+        self.frames.append(self.current)
+        self.current = []
+
+    def frame_totals(self, name: str) -> List[float]:
+        """Milliseconds spent in spans called name, per buffered frame"""
+        totals = []
+        for frame in self.frames:
+            totals.append(sum(duration for span_name, _, duration in frame if span_name == name) / 1e6)
+        return totals
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per span name: how many frames it ran in and the p50/p95/p99/max of its milliseconds per frame"""
+        per_frame: Dict[str, List[float]] = {}
+        for frame in self.frames:
+            totals: Dict[str, int] = {}
+            for name, _, duration in frame:
+                totals[name] = totals.get(name, 0) + duration
+            for name, total in totals.items():
+                per_frame.setdefault(name, []).append(total / 1e6)
+        results = {}
+        for name, samples in per_frame.items():
+            samples.sort()
+            pick = lambda p: samples[min(len(samples) - 1, int(p * len(samples)))]
+            results[name] = {"frames" : len(samples), "p50" : pick(0.5), "p95" : pick(0.95), "p99" : pick(0.99), "max" : samples[-1]}
+        return results
+
+    def print_stats(self):
+        print(f"{'span':<24}{'frames':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+        for name, row in sorted(self.stats().items(), key=lambda item: -item[1]["p95"]):
+            print(f"{name:<24}{row['frames']:>8}{row['p50']:>9.3f}{row['p95']:>9.3f}{row['p99']:>9.3f}{row['max']:>9.3f}")
+
+    def export_chrome_trace(self, filepath: str = None) -> str:
+        """Write the buffered frames as Chrome trace-event JSON"""
+        filepath = filepath or os.path.join(SAVES_DIR, f"trace_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        events = []
+        for frame in self.frames:
+            for name, start, duration in frame:
+                events.append({"name" : name, "ph" : "X", "ts" : start / 1000, "dur" : duration / 1000, "pid" : os.getpid(), "tid" : 0})
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        with open(filepath, 'w') as f:
+            json.dump({"traceEvents" : events, "displayTimeUnit" : "ms"}, f)
+        return filepath
+
+profiler = FrameProfiler()
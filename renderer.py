@@ -8,6 +8,8 @@ from objects.object_templates import CombatStatsMixin
 from objects.projectiles import BattleProjectile
 from options import GameOptions
 from combat import CombatManager
+from profiler import profiler, profiled
+from events.events import TimerManager
 
 if TYPE_CHECKING:
     from ultimalike import GameEngine
@@ -29,8 +31,65 @@ class Renderer:
         self.alpha_change_rate = 0
         self.veil = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.veil.fill(BLACK)
+        #Performance HUD (toggled from the debug console) and the counters it shows
+        self.show_perf_hud = False
+        self.perf_hud_background = pygame.Surface((PERF_HUD_WIDTH, PERF_HUD_HEIGHT))
+        self.perf_hud_background.set_alpha(190)
+        self.objects_drawn = 0
+        self.fov_recomputes = 0
+        self.text_cache_hits = 0
+        self.text_cache_misses = 0
+        #Damage tracking: frames where nothing could have changed aren't drawn at all, and
+        #otherwise only the damaged regions are redrawn and presented
+        self.full_redraw = True
+        self.last_blink_phase = -1
+        self.last_frame_idle = False
+        self.last_map_changes = None#(map, its changes) when the map view was last checked
+        self.map_view_rect = pygame.Rect(0, 0, MAP_VIEW_WIDTH, MAP_VIEW_HEIGHT)
+        self.perf_hud_rect = pygame.Rect(0, 0, PERF_HUD_WIDTH, PERF_HUD_HEIGHT)
+        #Pre-composed surfaces for batched drawing
+        self.health_bar_cache: dict[int, pygame.Surface] = {}
+        self.shape_cache: dict[tuple, pygame.Surface] = {}
+        self.sidebar_panel: pygame.Surface = None
+
+    def damage_all(self):
+        """Redraw the whole screen next frame"""
+        self.full_redraw = True
+
+    def map_animating(self) -> bool:
+        """Whether anything around the camera moves or animates without the player doing anything"""
+        if self.engine.event_manager.timer_manager.any_active():
+            return True
+        cam_x, cam_y = self.engine.camera
+        left, top = int(cam_x) - 1, int(cam_y) - 1
+        right, bottom = int(cam_x) + MAP_WIDTH + 1, int(cam_y) + MAP_HEIGHT + 1
+        for layer in self.engine.current_map.get_objects_in_rect(left, top, right, bottom):
+            for obj in layer:
+                if obj.is_animating():
+                    return True
+        return False
+
+    def frame_damage(self) -> List[pygame.Rect]:
+        """The screen regions that may have changed since the last frame drawn. Empty when none have."""
+        engine = self.engine
+        blink_phase = TimerManager.now() // CURSOR_BLINK_MS
+        blinking = engine.state in [GameState.DIALOG, GameState.DEBUG] and blink_phase != self.last_blink_phase
+        if self.full_redraw or self.fading or blinking:
+            self.full_redraw = False
+            self.last_blink_phase = blink_phase
+            return [self.screen.get_rect()]
+        damage = []
+        if engine.current_map and engine.party.members and engine.state not in MENU_STATES:
+            map_changes = (id(engine.current_map), engine.current_map.changes)
+            if self.map_animating() or map_changes != self.last_map_changes:
+                damage.append(self.map_view_rect)
+            self.last_map_changes = map_changes
+        if self.show_perf_hud:
+            damage.append(self.perf_hud_rect)
+        return damage
 
     def smooth_movement(self, obj: Node):
+        """Where obj is drawn while it moves. Only reads timers; GameEngine.update_objects settles finished moves."""
         timer_manager = self.engine.event_manager.timer_manager
         if obj.group and obj.group.progress:
             progress = obj.group.progress
@@ -40,20 +99,17 @@ class Renderer:
             
             if not timer_manager.is_active(actual_timer_name):
                 # No animation - use exact position
-                map_pos = obj.subtract_tuples(obj.position, self.engine.camera)
-                screen_x = int(round(map_pos[0] * TILE_WIDTH))
-                screen_y = int(round(map_pos[1] * TILE_HEIGHT))
+                screen_x = int(round((obj.position[0] - self.engine.camera[0]) * TILE_WIDTH))
+                screen_y = int(round((obj.position[1] - self.engine.camera[1]) * TILE_HEIGHT))
                 return screen_x, screen_y
             
             # Get progress and ensure it's bounded
-            progress = timer_manager.get_progress(actual_timer_name)
-            if obj.group:
-                obj.group.progress = progress
+            progress = timer_manager.get_progress(actual_timer_name, False)
         
         # Calculate interpolated world position
-        dx, dy = obj.subtract_tuples(obj.position, obj.old_position)
-        world_x = obj.old_position[0] + dx * progress
-        world_y = obj.old_position[1] + dy * progress
+        (x, y), (old_x, old_y) = obj.position, obj.old_position
+        world_x = old_x + (x - old_x) * progress
+        world_y = old_y + (y - old_y) * progress
         
         # Convert to screen coordinates with consistent rounding
         map_x = world_x - self.engine.camera[0]
@@ -61,12 +117,9 @@ class Renderer:
         
         screen_x = int(round(map_x * TILE_WIDTH))
         screen_y = int(round(map_y * TILE_HEIGHT))
-        if progress >= 1.0:
-            obj.old_position = obj.position
-        
         return screen_x, screen_y
 
-    #@time_function("Render Map: ") 
+    @profiled("render_map")
     def render_map(self):
         game_map = self.engine.current_map
         camera = self.engine.camera
@@ -89,6 +142,8 @@ class Renderer:
         visible_positions = self.get_visible_positions(observer_pos, MAP_WIDTH)
         
         # When rendering tiles, check visibility:
+        tile_blits = []#Tiles don't overlap, so they all go to the screen in one blits call
+        grid_rects = []
         for y in range(y0, y1):
             for x in range(x0, x1):
                 map_x = base_tile_x + x  
@@ -101,14 +156,17 @@ class Renderer:
                     screen_x = x * TILE_WIDTH - pixel_offset_x
                     screen_y = y * TILE_HEIGHT - pixel_offset_y
                     if tile:
+                        rect = pygame.Rect(screen_x, screen_y, TILE_WIDTH, TILE_HEIGHT)
                         if tile.image:
-                            self.screen.blit(tile.image, (screen_x, screen_y))
+                            tile_blits.append((tile.image, rect))
                         else:
-                            rect = pygame.Rect(screen_x, screen_y, TILE_WIDTH, TILE_HEIGHT)
                             pygame.draw.rect(self.screen, tile.color, rect)
 
                         if show_grid:
-                            pygame.draw.rect(self.screen, BLACK, rect, 1)
+                            grid_rects.append(rect)
+        self.screen.blits(tile_blits, False)
+        for rect in grid_rects:
+            pygame.draw.rect(self.screen, BLACK, rect, 1)
 
         def bump_movement(screen_x, screen_y, obj):
             """Handle bump animation using TimerManager progress"""
@@ -121,7 +179,7 @@ class Renderer:
             dx, dy = obj.bump_direction.value
             
             # Get progress (0.0 to 1.0)
-            progress = timer_manager.get_progress("player_bump")
+            progress = timer_manager.get_progress("player_bump", False)
             
             # Create a "bounce" effect - go out then come back
             if progress <= 0.5:
@@ -137,63 +195,87 @@ class Renderer:
             
             screen_x += offset_x
             screen_y += offset_y
-            
-            # Clean up when animation completes
-            if progress >= 1.0:
-                obj.is_bumping = False
-                obj.bump_direction = None
-                
             return screen_x, screen_y
     
         # Render map objects
+        #Only the tiles around the camera are looked up; the objects were updated by GameEngine.update_objects.
         timer_manager = self.engine.event_manager.timer_manager
         self.engine.update_camera()
-        for i, layer in self.engine.current_map.objects_by_layer.items():
+        left, top = int(cam_x) - 1, int(cam_y) - 1
+        right, bottom = int(cam_x) + MAP_WIDTH + 1, int(cam_y) + MAP_HEIGHT + 1
+
+        #Everything is collected in layer order as (surface, position) and submitted with a single
+        #blits call; health bars and the shapes of objects without images come from cached surfaces
+        leader = self.engine.party.get_leader()
+        in_combat = self.engine.state == GameState.COMBAT
+        objects_drawn = 0
+        object_blits = []
+        for layer in game_map.get_objects_in_rect(left, top, right, bottom):
             for obj in layer:
-                obj.update()
                 if type(obj) == Node:  # No need to render nodes
                     continue
                 if obj.position not in visible_positions: 
                     continue
                 elif obj.__is__(Character):  # If this is a party member other than the leader, don't render them outside of combat.
-                    if (not self.engine.state == GameState.COMBAT and not obj == self.engine.party.get_leader()):
+                    if (not in_combat and not obj == leader):
                         continue
                     
-                map_x, map_y = obj.subtract_tuples(obj.position, camera)
+                map_x, map_y = obj.position[0] - cam_x, obj.position[1] - cam_y
                 
                 if -1 <= map_x <= MAP_WIDTH and -1 <= map_y <= MAP_HEIGHT:
-                    screen_x, screen_y = obj.multiply_tuples((map_x, map_y), (TILE_WIDTH, TILE_HEIGHT))
-                    obj_in_walkers = obj in self.engine.event_manager.walkers
+                    objects_drawn += 1
+                    screen_x, screen_y = map_x * TILE_WIDTH, map_y * TILE_HEIGHT
                     
-                    if obj == self.engine.party.get_leader() and timer_manager.is_active("player_bump"):
+                    if obj == leader and timer_manager.is_active("player_bump"):
                         screen_x, screen_y = bump_movement(screen_x, screen_y, obj)
                     else:
                         screen_x, screen_y = self.smooth_movement(obj)
                     
                     #Draw Health bar
-                    if self.engine.state == GameState.COMBAT and obj.__is__(CombatStatsMixin):
-                        pygame.draw.rect(self.screen, RED, (screen_x + TILE_WIDTH//4, screen_y - TILE_HEIGHT//8, TILE_WIDTH//2, TILE_HEIGHT//8))
-                        percentage_health = obj.hp/obj.max_hp
-                        pygame.draw.rect(self.screen, GREEN, (screen_x + TILE_WIDTH//4, screen_y - TILE_HEIGHT//8, percentage_health*TILE_WIDTH//2, TILE_HEIGHT//8))
+                    if in_combat and obj.__is__(CombatStatsMixin):
+                        object_blits.append((self.get_health_bar(obj.hp/obj.max_hp), (screen_x + TILE_WIDTH//4, screen_y - TILE_HEIGHT//8)))
                     if obj.image:
-                        if obj != self.engine.party.get_leader() or not self.engine.event_manager.make_leader_invisible:
-                            self.screen.blit(obj.image, (screen_x, screen_y))
+                        if obj != leader or not self.engine.event_manager.make_leader_invisible:
+                            object_blits.append((obj.image, (screen_x, screen_y)))
                     elif obj.__is__(Character):
-                        rect = pygame.Rect(screen_x + TILE_WIDTH//8, screen_y + TILE_HEIGHT//8, TILE_WIDTH*3//4, TILE_HEIGHT*3//4)
-                        pygame.draw.ellipse(self.screen, obj.color, rect)
+                        object_blits.append((self.get_object_shape("ellipse", obj.color), (screen_x, screen_y)))
                     elif obj.__is__(ItemHolder):
-                        pygame.draw.circle(self.screen, obj.color, 
-                                        (screen_x + TILE_WIDTH//2, screen_y + TILE_HEIGHT//2), 4)
+                        object_blits.append((self.get_object_shape("dot", obj.color), (screen_x, screen_y)))
                     elif obj.__is__(NPC):
-                        pygame.draw.rect(self.screen, obj.color, 
-                                    (screen_x + + TILE_WIDTH//4, screen_y + TILE_HEIGHT//4, TILE_WIDTH//2, TILE_HEIGHT//2))
+                        object_blits.append((self.get_object_shape("square", obj.color), (screen_x, screen_y)))
                     elif obj.__is__(Teleporter):
-                        pygame.draw.circle(self.screen, obj.color, 
-                                        (screen_x + TILE_WIDTH//2, screen_y + TILE_HEIGHT//2), 4)
+                        object_blits.append((self.get_object_shape("dot", obj.color), (screen_x, screen_y)))
                     elif obj.__is__(Monster):
-                        pygame.draw.rect(self.screen, obj.color, 
-                                        (screen_x + TILE_WIDTH//4, screen_y + TILE_HEIGHT//4, TILE_WIDTH//2, TILE_HEIGHT//2))
+                        object_blits.append((self.get_object_shape("square", obj.color), (screen_x, screen_y)))
+        self.screen.blits(object_blits, False)
+        self.objects_drawn = objects_drawn
     
+    def get_health_bar(self, fraction: float) -> pygame.Surface:
+        """A health bar, red with the remaining fraction green, cached per pixel width of green"""
+        width, height = TILE_WIDTH//2, TILE_HEIGHT//8
+        green_width = max(0, min(width, int(fraction*width)))
+        if green_width not in self.health_bar_cache:
+            bar = pygame.Surface((width, height))
+            bar.fill(RED)
+            bar.fill(GREEN, (0, 0, green_width, height))
+            self.health_bar_cache[green_width] = bar
+        return self.health_bar_cache[green_width]
+
+    def get_object_shape(self, shape: str, color) -> pygame.Surface:
+        """The tile-sized placeholder drawn for an object without an image"""
+        key = (shape, tuple(color))
+        if key not in self.shape_cache:
+            surface = pygame.Surface((TILE_WIDTH, TILE_HEIGHT), pygame.SRCALPHA)
+            match shape:
+                case "ellipse":
+                    pygame.draw.ellipse(surface, color, (TILE_WIDTH//8, TILE_HEIGHT//8, TILE_WIDTH*3//4, TILE_HEIGHT*3//4))
+                case "dot":
+                    pygame.draw.circle(surface, color, (TILE_WIDTH//2, TILE_HEIGHT//2), 4)
+                case "square":
+                    pygame.draw.rect(surface, color, (TILE_WIDTH//4, TILE_HEIGHT//4, TILE_WIDTH//2, TILE_HEIGHT//2))
+            self.shape_cache[key] = surface
+        return self.shape_cache[key]
+
     def render_main_menu(self):
         self.screen.fill(BLACK)
         
@@ -498,6 +580,8 @@ class Renderer:
                 color = YELLOW if i + start_index == selected_file else WHITE
                 rendered = self.font.render(filename, True, color)
                 self.screen.blit(rendered, (40, 80 + (i + start_index) * 30))
+            if 0 <= selected_file - start_index < len(save_files):
+                self.render_save_slot_details(save_files[selected_file - start_index])
         
         # Instructions
         instructions = [
@@ -510,6 +594,29 @@ class Renderer:
             text = self.small_font.render(instruction, True, GRAY)
             self.screen.blit(text, (20, SCREEN_HEIGHT - 80 + i * 20))
     
+    def render_save_slot_details(self, filename: str):
+        """Show the thumbnail and slot.json info for the highlighted save"""
+        index = self.engine.save_manager.index
+        x, y = SCREEN_WIDTH // 2, 80
+        thumbnail = index.thumbnails.get(filename)
+        if thumbnail:
+            self.screen.blit(thumbnail, (x, y))
+            pygame.draw.rect(self.screen, GRAY, (x, y, thumbnail.get_width(), thumbnail.get_height()), 1)
+            y += thumbnail.get_height() + 10
+        slot = index.slots.get(filename)
+        if not slot:
+            return
+        hours, remainder = divmod(int(slot.get("play_time", 0)), 3600)
+        lines = [
+            slot.get("map", "").replace("_", " "),
+            f"Played {hours}:{remainder // 60:02d}",
+            f"Game time {slot.get('game_time', '')}",
+            f"Saved {slot.get('saved_at', '').replace('T', ' ')}"
+        ]
+        for line in lines:
+            self.screen.blit(self.get_cached_text(line, self.small_font, WHITE), (x, y))
+            y += 20
+    
     def draw_text_with_outline(self, text, font, x, y, text_color, outline_color=BLACK):
         """Draw text with a black outline for better visibility."""
         base = self.get_cached_text(text, font, text_color)
@@ -556,8 +663,7 @@ class Renderer:
             self.screen.blit(input_text, (input_rect.x + 5, input_rect.y))
             
             # Render blinking cursor
-            dialog_manager.cursor_blink += 1
-            if dialog_manager.cursor_blink % 60 < 30:  # Blink every second
+            if (TimerManager.now() - dialog_manager.cursor_blink) // CURSOR_BLINK_MS % 2 == 0:  # Blink every second
                 cursor_x = input_rect.x + 5 + self.font.size(dialog_manager.user_input)[0]
                 pygame.draw.line(self.screen, WHITE, 
                                (cursor_x, input_rect.y + 3), 
@@ -582,8 +688,7 @@ class Renderer:
         self.screen.blit(input_text, (input_rect.x + 5, input_rect.y + 3))
         
         # Render blinking cursor
-        dialog_manager.cursor_blink += 1
-        if dialog_manager.cursor_blink % 60 < 30:  # Blink every second
+        if (TimerManager.now() - dialog_manager.cursor_blink) // CURSOR_BLINK_MS % 2 == 0:  # Blink every second
             cursor_x = input_rect.x + 5 + self.font.size(dialog_manager.user_input)[0]
             pygame.draw.line(self.screen, WHITE, 
                             (cursor_x, input_rect.y + 3), 
@@ -614,7 +719,7 @@ class Renderer:
         self.render_bottom_text_box( "Combat Log", big_line)
         
         
-    #@time_function("Render Text Box: ")
+    @profiled("text_box")
     def render_bottom_text_box(self, speaker_name: str = "", current_line: str = "", dialog_width = MAP_VIEW_WIDTH):
         """Render the dialog interface"""
         # Create dialog box
@@ -671,39 +776,44 @@ class Renderer:
     def get_cached_text(self, text, font: pygame.font.Font, color):
         key = (text, font, color)
         if key not in self.text_cache:
+            self.text_cache_misses += 1
             self.text_cache[key] = font.render(text, True, color)
+        else:
+            self.text_cache_hits += 1
         return self.text_cache[key]
     
-    #@time_function("Render Sidebar: ")
+    @profiled("sidebar")
     def render_sidebar_stats(self):
         party = self.engine.party
         sidebar_width = SCREEN_WIDTH - MAP_VIEW_WIDTH 
         sidebar_x = SCREEN_WIDTH - sidebar_width
-        sidebar_rect = pygame.Rect(sidebar_x, 0, sidebar_width, SCREEN_HEIGHT)
         other_rect = pygame.Rect(0, MAP_VIEW_HEIGHT, MAP_VIEW_WIDTH, SCREEN_HEIGHT - MAP_VIEW_HEIGHT)
         
         # Draw dialog box background
-        pygame.draw.rect(self.screen, (40, 40, 60), sidebar_rect)
-        pygame.draw.rect(self.screen, (0, 0, 0), other_rect)
-        pygame.draw.rect(self.screen, WHITE, sidebar_rect, 2)
+        if not self.sidebar_panel:
+            self.sidebar_panel = pygame.Surface((sidebar_width, SCREEN_HEIGHT))
+            self.sidebar_panel.fill((40, 40, 60))
+            pygame.draw.rect(self.sidebar_panel, WHITE, self.sidebar_panel.get_rect(), 2)
+        self.screen.fill((0, 0, 0), other_rect)
         side_font_height = self.side_font.get_height()
-        colors = [WHITE, RED, BLUE, YELLOW, (255, 0, 255), (0, 255, 255), (255, 128, 0), (128, 255, 0)]
+        sidebar_blits = [(self.sidebar_panel, (sidebar_x, 0))]
         for i, character in enumerate(party.members):
             rendered = self.get_cached_text(f"{character.name}: Lvl-{character.level}", self.side_font, WHITE)
-            self.screen.blit(rendered, (MAP_VIEW_WIDTH + 10, 50*i + TILE_HEIGHT))
+            sidebar_blits.append((rendered, (MAP_VIEW_WIDTH + 10, 50*i + TILE_HEIGHT)))
             rendered = self.get_cached_text(f"HP: {character.hp}/{character.max_hp}", self.side_font, WHITE)
-            self.screen.blit(rendered, (MAP_VIEW_WIDTH + 10, side_font_height + 2 + 50*i + TILE_HEIGHT))
+            sidebar_blits.append((rendered, (MAP_VIEW_WIDTH + 10, side_font_height + 2 + 50*i + TILE_HEIGHT)))
             virtue_penalty_text = ""
             for type, virtue in character.virtue_manager.virtues.items():
                 if virtue["overuse"]:
                     virtue_penalty_text += f"{type.value[0].capitalize()}: {virtue["overuse"]}/{character.virtue_manager.get_threshold(type)} "
             if virtue_penalty_text:
                 rendered = self.get_cached_text(virtue_penalty_text, self.side_font, WHITE)
-                self.screen.blit(rendered, (MAP_VIEW_WIDTH + 10, 2*side_font_height + 2 + 50*i + TILE_HEIGHT))
+                sidebar_blits.append((rendered, (MAP_VIEW_WIDTH + 10, 2*side_font_height + 2 + 50*i + TILE_HEIGHT)))
             if character.image:
-                self.screen.blit(character.image, (SCREEN_WIDTH - TILE_WIDTH, 20 + 50*i + TILE_HEIGHT))
+                sidebar_blits.append((character.image, (SCREEN_WIDTH - TILE_WIDTH, 20 + 50*i + TILE_HEIGHT)))
         rendered = self.get_cached_text(f"{self.engine.schedule_manager.current_game_time}", self.side_font, WHITE)
-        self.screen.blit(rendered, (MAP_VIEW_WIDTH + 10, 20 + 4*side_font_height + (len(self.engine.party.members)+1)*TILE_HEIGHT))
+        sidebar_blits.append((rendered, (MAP_VIEW_WIDTH + 10, 20 + 4*side_font_height + (len(self.engine.party.members)+1)*TILE_HEIGHT)))
+        self.screen.blits(sidebar_blits, False)
 
 
     def render_cutscene(self):
@@ -769,6 +879,7 @@ class Renderer:
         if cache_key == self._fov_cache_key:
             return self._fov_cache  # cached set
 
+        self.fov_recomputes += 1
         ox, oy = observer_pos
         visible = set()
         visible.add((ox, oy))
@@ -1016,9 +1127,48 @@ class Renderer:
             self.screen.blit(sell_text, sell_text_rect)
             
             return [sell_rect]
+    def render_perf_hud(self):
+        """Frame time graph, per-subsystem milliseconds and a few counters, drawn over the top left of the map"""
+        self.screen.blit(self.perf_hud_background, (0, 0))
+        frames = list(profiler.frames)[-PERF_HUD_GRAPH_FRAMES:]
+        #Frame time graph, with lines at the 60 and 30 fps budgets
+        graph_bottom = PERF_HUD_GRAPH_HEIGHT + 5
+        scale = PERF_HUD_GRAPH_HEIGHT / PERF_HUD_GRAPH_MAX_MS
+        for budget_ms in (1000 / 60, 1000 / 30):
+            y = graph_bottom - int(budget_ms * scale)
+            pygame.draw.line(self.screen, GRAY, (5, y), (5 + PERF_HUD_GRAPH_FRAMES, y))
+        for i, frame in enumerate(frames):
+            frame_ms = sum(duration for name, _, duration in frame if name == "frame") / 1e6
+            color = GREEN if frame_ms < 1000 / 60 else YELLOW if frame_ms < 1000 / 30 else RED
+            pygame.draw.line(self.screen, color, (5 + i, graph_bottom), (5 + i, graph_bottom - int(min(frame_ms, PERF_HUD_GRAPH_MAX_MS) * scale)))
+        #Average milliseconds per subsystem over the last second
+        recent = frames[-60:]
+        totals = dict.fromkeys(PERF_HUD_SUBSYSTEMS, 0)
+        for frame in recent:
+            for name, _, duration in frame:
+                if name in totals:
+                    totals[name] += duration
+        lines = [f"{self.engine.clock.get_fps():5.1f} fps  {self.engine.sim_steps_last_frame} steps"]
+        lines += [f"{name:<11}{total / 1e6 / max(len(recent), 1):6.2f} ms" for name, total in totals.items()]
+        game_map = self.engine.current_map
+        text_lookups = self.text_cache_hits + self.text_cache_misses
+        lines += [
+            f"objects    {self.objects_drawn}/{len(game_map.objects) if game_map else 0}",
+            f"timers     {len(self.engine.event_manager.timer_manager.get_active_timers())}",
+            f"fov calcs  {self.fov_recomputes}",
+            f"text cache {len(self.text_cache)} ({100 * self.text_cache_hits / max(text_lookups, 1):.0f}% hits)"
+        ]
+        if self.engine.memory_monitor.samples:
+            lines.append(f"rss        {self.engine.memory_monitor.current_rss() / 2**20:.0f} MiB")
+        y = graph_bottom + 5
+        for line in lines:
+            #Rendered directly so the HUD doesn't fill the text cache it reports on
+            self.screen.blit(self.small_font.render(line, True, WHITE), (5, y))
+            y += self.small_font.get_linesize()
+
     #Screen transitions////////////
-    #@time_function("Render Fade: ")
-    def fade_render(self):
+    def advance_fade(self):
+        """Step the fade once per simulation step, so it lasts as long at any frame rate"""
         if self.fading:
             if self.alpha_change_rate == 0:
                 self.fading = False
@@ -1026,6 +1176,9 @@ class Renderer:
                 self.alpha += self.alpha_change_rate
                 if self.alpha < 0 or self.alpha > 255:
                     self.fading = False
+
+    @profiled("fade")
+    def fade_render(self):
         if self.alpha > 0:
             self.veil.set_alpha(self.alpha)
             self.screen.blit(self.veil, (0, 0))
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""
+Compact binary save files.
+
+A save file is a small uncompressed header followed by a (possibly compressed)
+stream of length-prefixed records, so saves can be written and read one map at a time.
+
+    header: MAGIC | version (u8) | compression (u8)
+    record: kind (u8) | name length (u16) | payload length (u32) | name | payload
+    payload: compact UTF-8 JSON, except for the turn history which is a packed
+             array of little-endian u32 turn durations
+
+The stream always ends with a RECORD_END record. The turn history record always
+directly follows the player record. A map is saved either as a full dump of its objects
+(RECORD_MAP) or, when it was built from its objs_*.json, as just the differences from
+that file (RECORD_MAP_DELTA, see Map.to_delta).
+"""
+
+import os
+import io
+import sys
+import json
+import gzip
+import lzma
+import time
+import struct
+from array import array
+from typing import Any, BinaryIO, Iterator, List, Tuple
+from constants import SAVES_DIR
+
+SAVE_FILE_NAME = "save.yaf"
+SLOT_FILE_NAME = "slot.json"
+THUMBNAIL_FILE_NAME = "thumbnail.png"
+MAGIC = b"YAFS"
+FORMAT_VERSION = 1
+HEADER = struct.Struct(">4sBB")
+RECORD_HEADER = struct.Struct(">BHI")
+
+RECORD_END = 0
+RECORD_PLAYER = 1
+RECORD_MAP = 2
+RECORD_TURN_HISTORY = 3
+RECORD_MAP_DELTA = 4
+
+COMPRESSIONS = {"none" : 0, "gzip" : 1, "lzma" : 2}
+DEFAULT_COMPRESSION = "gzip"
+
+SaveRecord = Tuple[int, str, bytes]
+
+def encode_payload(data: Any) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+def decode_payload(payload: bytes) -> Any:
+    return json.loads(payload.decode("utf-8"))
+
+def encode_turn_history(turn_history: List[int]) -> bytes:
+    packed = array("I", turn_history)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+def decode_turn_history(payload: bytes) -> List[int]:
+    packed = array("I")
+    packed.frombytes(payload)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tolist()
+
+def _open_body(f: BinaryIO, compression_id: int, mode: str):
+    match compression_id:
+        case 0:
+            return None
+        case 1:
+            return gzip.GzipFile(fileobj=f, mode=mode, compresslevel=6)
+        case 2:
+            return lzma.LZMAFile(f, mode=mode)
+    raise ValueError(f"Unknown save compression id {compression_id}")
+
+def write_save(f: BinaryIO, records: List[SaveRecord], compression: str = DEFAULT_COMPRESSION):
+    """Write a header and every record to the already opened binary file f"""
+    compression_id = COMPRESSIONS[compression]
+    f.write(HEADER.pack(MAGIC, FORMAT_VERSION, compression_id))
+    body = _open_body(f, compression_id, "wb")
+    out = body if body else f
+    for kind, name, payload in records:
+        encoded_name = name.encode("utf-8")
+        out.write(RECORD_HEADER.pack(kind, len(encoded_name), len(payload)))
+        out.write(encoded_name)
+        out.write(payload)
+    out.write(RECORD_HEADER.pack(RECORD_END, 0, 0))
+    if body:
+        body.close()#Flushes the compressor; f itself stays open
+
+def read_records(f: BinaryIO) -> Iterator[SaveRecord]:
+    """Yield the raw (kind, name, payload) of each record in the save, one record at a time"""
+    header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError("Save file is truncated")
+    magic, version, compression_id = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a You Are Forel save file")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Save format version {version} is newer than this game supports ({FORMAT_VERSION})")
+    body = _open_body(f, compression_id, "rb")
+    source = body if body else f
+    while True:
+        record_header = source.read(RECORD_HEADER.size)
+        if len(record_header) < RECORD_HEADER.size:
+            raise ValueError("Save file ended before its end record")
+        kind, name_length, payload_length = RECORD_HEADER.unpack(record_header)
+        if kind == RECORD_END:
+            return
+        name = source.read(name_length).decode("utf-8")
+        yield kind, name, source.read(payload_length)
+
+def read_save(f: BinaryIO) -> Iterator[Tuple[int, str, Any]]:
+    """Yield (kind, name, data) for each record in the save, decoding one record at a time"""
+    for kind, name, payload in read_records(f):
+        if kind == RECORD_TURN_HISTORY:
+            yield kind, name, decode_turn_history(payload)
+        else:
+            yield kind, name, decode_payload(payload)
+
+def player_records(save_data: dict) -> List[SaveRecord]:
+    """The player record and the turn history record that follows it"""
+    save_data = dict(save_data)
+    turn_history = save_data.pop("turn_history", [])
+    return [(RECORD_PLAYER, "", encode_payload(save_data)), (RECORD_TURN_HISTORY, "", encode_turn_history(turn_history))]
+
+def map_record(map_name: str, objects_data: dict) -> SaveRecord:
+    return RECORD_MAP, map_name, encode_payload(objects_data)
+
+def map_delta_record(map_name: str, objects_delta: dict) -> SaveRecord:
+    return RECORD_MAP_DELTA, map_name, encode_payload(objects_delta)
+
+def convert_json_save(folderpath: str, compression: str = DEFAULT_COMPRESSION) -> str:
+    """Convert an old player_data.json + objs_*_updated.json save folder into a single save file"""
+    with open(os.path.join(folderpath, "player_data.json"), 'r') as f:
+        records = player_records(json.load(f))
+    for file in sorted(os.listdir(folderpath)):
+        if file.startswith("objs_") and file.endswith("_updated.json"):
+            map_name = file.split("objs_")[1].split("_updated.json")[0]
+            with open(os.path.join(folderpath, file), 'r') as f:
+                records.append(map_record(map_name, json.load(f)))
+    filepath = os.path.join(folderpath, SAVE_FILE_NAME)
+    with open(filepath, 'wb') as f:
+        write_save(f, records, compression)
+    return filepath
+
+def benchmark(folderpath: str, turns: int = 200000, repeats: int = 5):
+    """
+    Compare size and load time of the JSON and binary formats for a save padded out to
+    look like a long play session (turns entries of turn_history).
+    """
+    with open(os.path.join(folderpath, "player_data.json"), 'r') as f:
+        save_data = json.load(f)
+    save_data["turn_history"] = [1 if i % 7 else 2 for i in range(turns)]
+    maps = {}
+    for file in sorted(os.listdir(folderpath)):
+        if file.startswith("objs_") and file.endswith("_updated.json"):
+            with open(os.path.join(folderpath, file), 'r') as f:
+                maps[file] = json.load(f)
+
+    def time_it(load):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            load()
+        return (time.perf_counter() - start) * 1000 / repeats
+
+    json_files = {"player_data.json" : json.dumps(save_data, indent = 2).encode("utf-8")}
+    json_files |= {file : json.dumps(data, indent = 2).encode("utf-8") for file, data in maps.items()}
+    results = {"json" : (sum(len(data) for data in json_files.values()), time_it(lambda: [json.loads(data) for data in json_files.values()]))}
+
+    records = player_records(save_data) + [map_record(file, data) for file, data in maps.items()]
+    for compression in COMPRESSIONS:
+        buffer = io.BytesIO()
+        write_save(buffer, records, compression)
+        data = buffer.getvalue()
+        results[compression] = (len(data), time_it(lambda: list(read_save(io.BytesIO(data)))))
+
+    print(f"{os.path.basename(folderpath)} with {turns} turns of history:")
+    for label, (size, load_ms) in results.items():
+        print(f"  {label:>5}: {size/1024:10.1f} KiB  load {load_ms:8.2f} ms")
+    return results
+
+if __name__ == "__main__":
+    # python save_format.py convert <save folder> [none|gzip|lzma]
+    # python save_format.py bench <save folder> [turns]
+    if len(sys.argv) < 3 or sys.argv[1] not in ["convert", "bench"]:
+        print("usage: save_format.py convert|bench <save folder> [compression|turns]")
+        sys.exit(1)
+    folder = sys.argv[2] if os.path.isdir(sys.argv[2]) else os.path.join(SAVES_DIR, sys.argv[2])
+    if sys.argv[1] == "convert":
+        print(convert_json_save(folder, sys.argv[3] if len(sys.argv) > 3 else DEFAULT_COMPRESSION))
+    else:
+        benchmark(folder, int(sys.argv[3]) if len(sys.argv) > 3 else 200000)
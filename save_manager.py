@@ -1,17 +1,127 @@
 import os
 import json
-from typing import Tuple, List, TYPE_CHECKING
+import queue
+import pygame
+import threading
+from functools import partial
+from typing import Tuple, List, Dict, Callable, BinaryIO, TYPE_CHECKING
+import save_format
 from objects.characters import Party
+from objects.map_objects import Map, MapCollection
 from options import GameOptions
 from events.events import EventManager
-from constants import MAPS_DIR, SAVES_DIR, GameState
+from constants import MAPS_DIR, SAVES_DIR, MAP_VIEW_WIDTH, MAP_VIEW_HEIGHT, GameState
 import datetime
 if TYPE_CHECKING:
     from ultimalike import GameEngine
 
+class SaveWriter:
+    """Writes finished save snapshots to disk on a background thread."""
+    def __init__(self):
+        self.jobs: queue.Queue = queue.Queue()
+        self.failures: queue.Queue = queue.Queue()#(filepath, error, on_failed) for writes the main thread hasn't reported yet
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, filepath: str, write_func: Callable[[BinaryIO], None], on_done: Callable[[], None] = None, on_failed: Callable[[], None] = None):
+        """
+        Queue write_func to fill filepath, which it is handed opened in binary mode.
+        on_done is called from the writer thread once the file is in place; if the write fails,
+        on_failed is handed back to the main thread through take_failures instead.
+        """
+        self.jobs.put((filepath, write_func, on_done, on_failed))
+
+    def flush(self):
+        """Block until every queued snapshot has been written"""
+        self.jobs.join()
+
+    def take_failures(self) -> List[Tuple[str, Exception, Callable[[], None]]]:
+        """The writes that failed since the last call"""
+        failures = []
+        while not self.failures.empty():
+            failures.append(self.failures.get())
+        return failures
+
+    def _run(self):
+        while True:
+            filepath, write_func, on_done, on_failed = self.jobs.get()
+            try:
+                self.write_atomic(filepath, write_func)
+                if on_done:
+                    on_done()
+            except Exception as e:
+                self.failures.put((filepath, e, on_failed))
+                print(f"Error writing save to {filepath}: {e}")
+            finally:
+                self.jobs.task_done()
+
+    @staticmethod
+    def write_atomic(filepath: str, write_func: Callable[[BinaryIO], None]):
+        """Write to a temp file and rename it over filepath, so a crash never leaves half a save"""
+        temp_path = filepath + ".tmp"
+        with open(temp_path, 'wb') as f:
+            write_func(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+
+class SaveIndex:
+    """
+    The save/load menu's list of save slots and their metadata, so the menu doesn't have to
+    walk the saves folder every frame. Rescanned only after a save finishes writing or
+    when the saves folder's mtime changes.
+    """
+    def __init__(self):
+        self.names: List[str] = []
+        self.slots: Dict[str, dict] = {}#folder name -> contents of its slot.json
+        self.thumbnails: Dict[str, pygame.Surface] = {}
+        self.stale = True
+        self.mtime = None
+
+    def invalidate(self):
+        self.stale = True
+
+    def get_save_files(self) -> List[str]:
+        if not self.stale:
+            try:
+                mtime = os.stat(SAVES_DIR).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime == self.mtime:
+                return self.names
+        self.refresh()
+        return self.names
+
+    def refresh(self):
+        self.stale = False#Cleared first so a save finishing mid-scan still triggers another
+        os.makedirs(SAVES_DIR, exist_ok=True)
+        self.mtime = os.stat(SAVES_DIR).st_mtime_ns
+        self.names = sorted(folder_name for folder_name in os.listdir(SAVES_DIR) if os.path.isdir(os.path.join(SAVES_DIR, folder_name)))
+        self.slots = {}
+        self.thumbnails = {}
+        for folder_name in self.names:
+            slot_path = os.path.join(SAVES_DIR, folder_name, save_format.SLOT_FILE_NAME)
+            if os.path.exists(slot_path):
+                try:
+                    with open(slot_path, 'r') as f:
+                        self.slots[folder_name] = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"Error reading {slot_path}: {e}")
+            thumbnail_path = os.path.join(SAVES_DIR, folder_name, save_format.THUMBNAIL_FILE_NAME)
+            if os.path.exists(thumbnail_path):
+                try:
+                    self.thumbnails[folder_name] = pygame.image.load(thumbnail_path)
+                except pygame.error as e:
+                    print(f"Error reading {thumbnail_path}: {e}")
+
 class SaveManager:
+    THUMBNAIL_SIZE = (MAP_VIEW_WIDTH // 6, MAP_VIEW_HEIGHT // 6)
     def __init__(self, engine: 'GameEngine'):
         self.engine = engine
+        self.writer = SaveWriter()
+        self.index = SaveIndex()
+        self.compression = save_format.DEFAULT_COMPRESSION
+        self.map_records: Dict[str, save_format.SaveRecord] = {}#map name -> encoded objects from the last save
     @staticmethod
     def ensure_directories(foldername: str = ""):
         """Create necessary directories if they don't exist"""
@@ -21,7 +131,11 @@ class SaveManager:
             os.makedirs(f"{SAVES_DIR}/{foldername}", exist_ok=True)
     
     def save_game(self, foldername: str):
-        """Save game state to file"""
+        """
+        Save game state to file.
+        Only maps that changed since the last save are re-serialized; the actual
+        writing happens on the background SaveWriter thread.
+        """
         self.ensure_directories(foldername)
         save_data = {
             "party": self.engine.party.to_dict(),
@@ -32,31 +146,118 @@ class SaveManager:
             "time" : list(self.engine.schedule_manager.current_game_time.timetuple()[:6]),
             "old_time" : list(self.engine.schedule_manager.last_game_time.timetuple()[:6]),
             "turn_history": self.engine.schedule_manager.turn_history,
+            "play_time": self.engine.play_time,
             "version": "0.0"
         }
         
         folderpath = os.path.join(SAVES_DIR, f"{foldername}")
-        filepath = os.path.join(folderpath, "player_data.json")
-        with open(filepath, 'w') as f:
-            json.dump(save_data, f, indent = 2)
+        records = save_format.player_records(save_data)
+        encoded = []
         for map_name, map in self.engine.maps.items():
-            filepath = os.path.join(folderpath, f"objs_{map_name}_updated.json")
-            with open(filepath, 'w') as f:
-                json.dump(map.to_dict(), f, indent = 2)
+            #The current map changes every turn in ways nothing else tracks, so it is always re-encoded.
+            if map.dirty or map is self.engine.current_map or map_name not in self.map_records:
+                self.map_records[map_name] = self.pack_map(map_name, map)
+                map.dirty = False
+                encoded.append(map_name)
+            records.append(self.map_records[map_name])
+        for record in self.engine.maps.deferred.values():
+            #Maps nobody has visited since loading are saved exactly as they were loaded.
+            records.append(record)
+        filepath = os.path.join(folderpath, save_format.SAVE_FILE_NAME)
+        self.writer.submit(filepath, partial(save_format.write_save, records=records, compression=self.compression), on_failed=partial(self.unsave_maps, encoded))
+        slot = {
+            "map" : self.engine.current_map.name,
+            "play_time" : self.engine.play_time,
+            "game_time" : str(self.engine.schedule_manager.current_game_time),
+            "saved_at" : datetime.datetime.now().isoformat(timespec="seconds")
+        }
+        slot_text = json.dumps(slot, indent = 2).encode("utf-8")
+        thumbnail = self.capture_thumbnail()
+        if thumbnail:
+            self.writer.submit(os.path.join(folderpath, save_format.THUMBNAIL_FILE_NAME), lambda f: pygame.image.save(thumbnail, f, save_format.THUMBNAIL_FILE_NAME))
+        self.writer.submit(os.path.join(folderpath, save_format.SLOT_FILE_NAME), lambda f: f.write(slot_text), self.on_slot_written)
+        self.engine.memory_monitor.checkpoint(f"save {foldername}")
+
+    def unsave_maps(self, map_names: List[str]):
+        """Mark maps whose save failed to write as changed again, so the next save encodes them afresh"""
+        for map_name in map_names:
+            self.map_records.pop(map_name, None)
+            if map_name in self.engine.maps.keys():
+                self.engine.maps[map_name].dirty = True
+
+    def report_failed_writes(self):
+        """Tell the player about saves that failed to write. Main thread only."""
+        for filepath, error, on_failed in self.writer.take_failures():
+            if on_failed:
+                on_failed()
+            self.engine.append_to_message_log(f"Could not save {os.path.basename(filepath)}: {error}")
+
+    def on_slot_written(self):
+        """Called from the writer thread once a save is complete, so the save menu shows it"""
+        self.index.invalidate()
+        self.engine.renderer.damage_all()
+
+    def capture_thumbnail(self) -> pygame.Surface:
+        """Draw the map view and keep a shrunken copy of it. The menu is redrawn over it before the next frame is presented."""
+        if not self.engine.current_map or not self.engine.party.get_leader():
+            return None
+        self.engine.renderer.render_map()
+        self.engine.renderer.damage_all()
+        view = self.engine.screen.subsurface(pygame.Rect(0, 0, MAP_VIEW_WIDTH, MAP_VIEW_HEIGHT))
+        return pygame.transform.smoothscale(view, self.THUMBNAIL_SIZE)
 
-    
     def load_game(self, foldername: str) -> Tuple[Party, GameOptions]:
-        """Load game state from file"""
+        """
+        Load game state from file.
+        Only the current map and the maps adjacent to it are built right away; every other
+        saved map is deferred until something looks it up in engine.maps.
+        """
         folderpath = os.path.join(SAVES_DIR, foldername)
+        self.writer.flush()#Don't read a save that is still being written
+        self.report_failed_writes()
         
         if not os.path.exists(folderpath):
             raise FileNotFoundError(f"Save folder not found: {folderpath}")
         
-        filepath = os.path.join(folderpath, "player_data.json")
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"Save file not found: {filepath}")
-        with open(filepath, 'r') as f:
-            save_data = json.load(f)
+        self.engine.maps = MapCollection(self.restore_map, self.pack_map)
+        filepath = os.path.join(folderpath, save_format.SAVE_FILE_NAME)
+        if os.path.exists(filepath):
+            with open(filepath, 'rb') as f:
+                for record in save_format.read_records(f):
+                    kind, name, payload = record
+                    if kind == save_format.RECORD_PLAYER:
+                        save_data = save_format.decode_payload(payload)
+                    elif kind == save_format.RECORD_TURN_HISTORY:
+                        save_data["turn_history"] = save_format.decode_turn_history(payload)
+                        self.load_player_data(save_data)
+                    elif kind in [save_format.RECORD_MAP, save_format.RECORD_MAP_DELTA]:
+                        self.engine.maps.defer(name, record)
+        else:
+            #Saves from before save.yaf existed: one player_data.json plus one json file per map
+            filepath = os.path.join(folderpath, "player_data.json")
+            if not os.path.exists(filepath):
+                raise FileNotFoundError(f"Save file not found: {filepath}")
+            with open(filepath, 'r') as f:
+                save_data = json.load(f)
+            self.load_player_data(save_data)
+            for file in os.listdir(folderpath):
+                if file.startswith("objs_") and file.endswith("_updated.json"):
+                    with open(os.path.join(folderpath, file), 'rb') as f:
+                        map_name = file.split("objs_")[1].split("_updated.json")[0]
+                        self.engine.maps.defer(map_name, (save_format.RECORD_MAP, map_name, f.read()))
+        self.engine.current_map = self.engine.maps[save_data["current_map"]]
+        for map_name in self.engine.current_map.get_adjacent_map_names():
+            if map_name in self.engine.maps.deferred:
+                self.engine.maps[map_name]
+        self.map_records = {}
+        self.engine.replace_state(GameState.TOWN)
+        party_leader = self.engine.party.get_leader()
+        party_leader.map = self.engine.current_map
+        for i in self.engine.party.members:
+            self.engine.current_map.add_object(i)
+        self.engine.memory_monitor.checkpoint(f"load {foldername}")
+
+    def load_player_data(self, save_data: dict):
         self.engine.party = Party.from_dict(save_data["party"], self.engine)
         self.engine.options = GameOptions.from_dict(save_data.get("options", {}))
         self.engine.event_manager = EventManager.from_dict(save_data["events"], self.engine)
@@ -64,37 +265,29 @@ class SaveManager:
         self.engine.schedule_manager.turn_history = save_data.get("turn_history", [])
         self.engine.schedule_manager.current_game_time = datetime.datetime(*save_data["time"])
         self.engine.schedule_manager.last_game_time = datetime.datetime(*save_data["old_time"])
-        for file in os.listdir(folderpath):
-            if file.startswith("objs_") and file.endswith("_updated.json"):
-                filepath = os.path.join(folderpath, file)
-                with open(filepath, 'r') as f:
-                    updated_object_data = json.load(f)
-                map_name = file.split("objs_")[1].split("_updated.json")[0]
-                for obj in updated_object_data:
-                    if updated_object_data[obj] and updated_object_data[obj]["position"]:
-                        updated_object_data[obj]["position"] = (updated_object_data[obj]["position"][0], updated_object_data[obj]["position"][1])
-                self.engine.load_map(map_name, updated_object_data)
-        self.engine.current_map = self.engine.maps[save_data["current_map"]]
-        self.engine.replace_state(GameState.TOWN)
-        party_leader = self.engine.party.get_leader()
-        party_leader.map = self.engine.current_map
-        for i in self.engine.party.members:
-            self.engine.current_map.add_object(i)
-        
+        self.engine.play_time = save_data.get("play_time", 0.0)
+
+    def pack_map(self, map_name: str, game_map: Map) -> save_format.SaveRecord:
+        """Encode a built map's objects as the record save_game writes for it, which restore_map can rebuild it from"""
+        self.map_records.pop(map_name, None)
+        if game_map.pristine is not None:
+            return save_format.map_delta_record(map_name, game_map.to_delta())
+        return save_format.map_record(map_name, game_map.to_dict())
 
+    def restore_map(self, map_name: str, record: save_format.SaveRecord):
+        """Build a deferred map from its saved record"""
+        kind, _, payload = record
+        if kind == save_format.RECORD_MAP_DELTA:
+            self.engine.load_map(map_name, objs_delta = save_format.decode_payload(payload))
+        else:
+            self.load_map_objects(map_name, save_format.decode_payload(payload))
+
+    def load_map_objects(self, map_name: str, updated_object_data: dict):
+        for obj in updated_object_data:
+            if updated_object_data[obj] and updated_object_data[obj]["position"]:
+                updated_object_data[obj]["position"] = (updated_object_data[obj]["position"][0], updated_object_data[obj]["position"][1])
+        self.engine.load_map(map_name, updated_object_data)
     
-    @staticmethod
-    def get_save_files() -> List[str]:
+    def get_save_files(self) -> List[str]:
         """Get list of available save files"""
-        SaveManager.ensure_directories()
-        
-        if not os.path.exists(SAVES_DIR):
-            return []
-        
-        saves = []
-        for folder_name in os.listdir(SAVES_DIR):
-            if os.path.isdir(os.path.join(SAVES_DIR,folder_name)):
-                saves.append(folder_name)
-        
-        return sorted(saves)
-    
+        return self.index.get_save_files()
@@ -61,6 +61,11 @@ class ScheduleManager:
         except json.JSONDecodeError:
             print(f"Error: Invalid JSON in {"schedule.json"}. Using empty schedules.")
             return {}
+        #Generated worlds (see worldgen.py) keep their NPCs' schedules in their own schedule_<world>.json
+        for file_name in sorted(os.listdir(SKEJ_DIR)):
+            if file_name.startswith("schedule_") and file_name.endswith(".json"):
+                with open(os.path.join(SKEJ_DIR, file_name), 'r') as f:
+                    data.update(json.load(f))
         
         for npc_name, schedule_data in data.items():
             events = []
@@ -1,14 +1,25 @@
 import pygame
 import os
+from typing import TYPE_CHECKING
 from constants import SOUNDS_DIR
+if TYPE_CHECKING:
+    from asset_manager import AssetManager
 
 pygame.mixer.init()
 
 class SoundDatabase:
-    def __init__(self):
+    def __init__(self, assets: 'AssetManager' = None):
+        """With an AssetManager the files are decoded on its pool; wait_all("sound ") before using them"""
         self.sound = {}
         fs_folder = os.path.join(SOUNDS_DIR, "footsteps")
         onlyfiles = [f for f in os.listdir(fs_folder) if os.path.isfile(os.path.join(fs_folder, f))]
         for file_name in onlyfiles:
             if file_name.endswith(".wav"):
-                self.sound[file_name[:-4]] = pygame.mixer.Sound(os.path.join(fs_folder, file_name))
+                name, path = file_name[:-4], os.path.join(fs_folder, file_name)
+                if assets:
+                    assets.submit(f"sound {name}", lambda path=path: pygame.mixer.Sound(path), lambda sound, name=name: self.add(name, sound))
+                else:
+                    self.add(name, pygame.mixer.Sound(path))
+
+    def add(self, name: str, sound: pygame.mixer.Sound):
+        self.sound[name] = sound
@@ -6,9 +6,16 @@ import os
 import pygame
 if TYPE_CHECKING:
     from ultimalike import GameEngine
+    from asset_manager import AssetManager
 class SpriteDatabase:
+    """
+    Sprite sheets by name. A sheet is decoded the first time something asks for it, and a skin colour
+    variant of a Generic People sheet the first time a node with that skin is drawn. queue_preload
+    has the AssetManager's pool decode them all ahead of time instead.
+    """
     def __init__(self, engine: 'GameEngine'):
-        self.sprites = {}
+        self.sprites = {}#sheet name -> decoded sheet, for the sheets used so far
+        self.sheet_files = {}#sheet name -> png path, for every sheet there is
         self.icons = {}
         self.engine = engine
         self.color_variants = {}
@@ -31,24 +38,63 @@ class SpriteDatabase:
         for file_name in onlyfiles:
             if file_name.endswith(".png"):
                 sheet_name = file_name[:-4]
-                self.sprites[sheet_name] = pygame.transform.scale_by(pygame.image.load(os.path.join(IMAGE_DIR, file_name)).convert_alpha(), 1)
-                
-                # Pre-generate color variants for people sprites
+                self.sheet_files[sheet_name] = os.path.join(IMAGE_DIR, file_name)
+                #Variants are added by replacing the inner dict, so the dicts never change while something reads them
                 if sheet_name.startswith("Generic People"):
                     self.color_variants[sheet_name] = {}
-                    for skin_color in self.common_skin_colors:
-                        variant_sheet = replace_color_threshold(self.sprites[sheet_name].copy(), GRAY, skin_color)
-                        self.color_variants[sheet_name][skin_color] = variant_sheet
-                
+
+    def get_sheet(self, sheet_name: str) -> pygame.Surface | None:
+        sheet = self.sprites.get(sheet_name)
+        if sheet is None and sheet_name in self.sheet_files:
+            if not self.engine.assets.wait(f"sheet {sheet_name}"):#Not already decoding in the background
+                self.finish_sheet(sheet_name, pygame.image.load(self.sheet_files[sheet_name]))
+            sheet = self.sprites.get(sheet_name)
+        return sheet
+
+    def finish_sheet(self, sheet_name: str, image: pygame.Surface):
+        """Main thread half of loading a sheet"""
+        if sheet_name not in self.sprites:
+            self.sprites[sheet_name] = pygame.transform.scale_by(image.convert_alpha(), 1)
+
+    def get_color_variant(self, sheet_name: str, skin_color: tuple[int, int, int]) -> pygame.Surface:
+        variant = self.color_variants[sheet_name].get(skin_color)
+        if variant is None:
+            if not self.engine.assets.wait(f"{sheet_name} {skin_color}"):
+                self.finish_color_variant(sheet_name, skin_color, replace_color_threshold(self.get_sheet(sheet_name), GRAY, skin_color))
+            variant = self.color_variants[sheet_name][skin_color]
+        return variant
+
+    def finish_color_variant(self, sheet_name: str, skin_color: tuple[int, int, int], variant: pygame.Surface):
+        if skin_color not in self.color_variants[sheet_name]:
+            self.color_variants[sheet_name] = {**self.color_variants[sheet_name], skin_color : variant}
+
+    def queue_preload(self, assets: 'AssetManager'):
+        """
+        Decode every sheet on the asset pool. Once a Generic People sheet is converted on the
+        main thread, its skin colour variants go to the pool in turn.
+        """
+        for sheet_name, path in self.sheet_files.items():
+            if sheet_name not in self.sprites:
+                assets.submit(f"sheet {sheet_name}", lambda path=path: pygame.image.load(path), lambda image, sheet_name=sheet_name: self.preload_finished(assets, sheet_name, image))
+
+    def preload_finished(self, assets: 'AssetManager', sheet_name: str, image: pygame.Surface):
+        self.finish_sheet(sheet_name, image)
+        if sheet_name in self.color_variants:
+            sheet = self.sprites[sheet_name]
+            for skin_color in self.common_skin_colors:
+                if skin_color not in self.color_variants[sheet_name]:
+                    assets.submit(f"{sheet_name} {skin_color}", lambda skin_color=skin_color: replace_color_threshold(sheet, GRAY, skin_color),
+                                  lambda variant, skin_color=skin_color: self.finish_color_variant(sheet_name, skin_color, variant))
+
     def get_slide(self, slide_name:str):
-        slide = self.sprites.get(slide_name)
+        slide = self.get_sheet(slide_name)
         if slide:
             self.engine.cutscene_manager.current_image = slide
     def get_sprite(self, node: Node, new_row: int = None, new_col: int = None, is_delta: bool = False):
         if not "spritesheet" in node.args:
             return
         sheet_name = node.args["spritesheet"][0]
-        sheet = self.sprites.get(sheet_name)
+        sheet = self.get_sheet(sheet_name)
         if not sheet:
             return
         if not new_row is None:
@@ -66,9 +112,9 @@ class SpriteDatabase:
         sprite_width = TILE_WIDTH*node.width_in_tiles
         sprite_height = TILE_HEIGHT*node.height_in_tiles
         
-        # Use pre-generated color variant if available
-        if sheet_name.startswith("Generic People") and node.skin_color in self.color_variants.get(sheet_name, {}):
-            sheet = self.color_variants[sheet_name][node.skin_color]
+        # Use the color variant for common skin colors
+        if sheet_name in self.color_variants and node.skin_color in self.common_skin_colors:
+            sheet = self.get_color_variant(sheet_name, node.skin_color)
             node.image = sheet.subsurface(pygame.Rect(
                 sprite_col * sprite_width, 
                 sprite_row * sprite_height, 
@@ -78,40 +124,19 @@ class SpriteDatabase:
         else:
             node.image = sheet.subsurface(pygame.Rect(sprite_col*sprite_width, sprite_row*sprite_height, sprite_width, sprite_height))
 
-def replace_color_threshold(surface, old_color, new_color, threshold=0):
-        # Create a mask for the color to replace
-        """Replace only gray colors in a specific range, preserving outlines and transparency"""
+def replace_color_threshold(surface: pygame.Surface, old_color, new_color, threshold: int = 0) -> pygame.Surface:
+    """
+    A copy of surface with the pixels of old_color (R, G and B each within threshold) changed to new_color.
+    Each pixel keeps its alpha, and fully transparent ones are left alone. The work is done with masks and
+    blits rather than per pixel, so it's quick and doesn't hold the GIL; it can run off the main thread as
+    long as surface already has per-pixel alpha.
+    """
+    if not surface.get_flags() & pygame.SRCALPHA:
         surface = surface.convert_alpha()
-        new_surface = surface.copy()
-        
-        # Create a pixel array for faster processing
-        pixel_array = pygame.PixelArray(new_surface)
-        original_array = pygame.PixelArray(surface)
-        
-        width, height = surface.get_size()
-        
-        for x in range(width):
-            for y in range(height):
-                # Get the original pixel color
-                pixel_color = surface.unmap_rgb(original_array[x, y])
-                
-                # Skip transparent pixels
-                if len(pixel_color) > 3 and pixel_color[3] == 0:
-                    continue
-                
-                # Check if pixel is in the gray range we want to replace
-                if pixel_color[:3] == old_color:
-                    
-                    # Replace with skin color
-                    if len(pixel_color) > 3 and len(new_color) < 4:  # Has alpha
-                        new_color = (*new_color, pixel_color[3])
-                    else:
-                        new_color = new_color
-                    pixel_array[x, y] = new_surface.map_rgb(new_color)
-        
-        # Clean up
-        del pixel_array
-        del original_array
-        
-        return new_surface
-    
\ No newline at end of file
+    matching = pygame.mask.from_threshold(surface, old_color, (threshold + 1, threshold + 1, threshold + 1, 255))
+    matching = matching.overlap_mask(pygame.mask.from_surface(surface, 0), (0, 0))
+    new_surface = surface.copy()
+    #Zero the colour of the matching pixels (keeping alpha), then add the new colour to them
+    new_surface.blit(matching.to_surface(setcolor=(0, 0, 0, 255), unsetcolor=(255, 255, 255, 255)), (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    new_surface.blit(matching.to_surface(setcolor=(*new_color[:3], 0), unsetcolor=(0, 0, 0, 0)), (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+    return new_surface
@@ -1,5 +1,6 @@
 from typing import List, Dict, Any, Optional, TYPE_CHECKING
-from tiles.tiles import Tile
+from weakref import WeakValueDictionary
+from tiles.tiles import Tile, TileLayer
 from tiles.tile_templates import Floor
 if TYPE_CHECKING:
     from ultimalike import GameEngine
@@ -7,6 +8,8 @@ class TileDatabase:
     def __init__(self, engine: 'GameEngine'):
         self.tiles: Dict[str, Tile] = {}
         self.engine = engine
+        #map name -> its TileLayer, for as long as some Map (or preloaded MapFiles) still uses it
+        self.base_layers: WeakValueDictionary[str, TileLayer] = WeakValueDictionary()
         def get_all_subclasses(subclass):
             subclasses = subclass.__subclasses__()
             for subclass in subclasses:
@@ -56,6 +56,16 @@ class Tile:
     def default_args() -> dict:
         return {}
     
+class TileLayer:
+    """
+    A map's tiles as built from its files, one tuple of Tiles per row. Never changed once built,
+    so every Map built from the same files shares one (see TileDatabase.base_layers) and keeps
+    its own changes in Map.tile_overlay.
+    """
+    __slots__ = ("rows", "__weakref__")
+    def __init__(self, rows: tuple[tuple[Optional[Tile], ...], ...]):
+        self.rows = rows
+
 class StairsLevelAdjust(Tile):   
     pass
 
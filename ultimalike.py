@@ -1,5 +1,17 @@
 import os
+import sys
+#Headless runs (soak tests, benchmarks, servers with no display) use SDL's dummy drivers.
+#The drivers are picked when pygame initializes, so this has to be decided before anything
+#else imports pygame (sound.sound initializes the mixer on import).
+HEADLESS = "--headless" in sys.argv or os.environ.get("YAF_HEADLESS") == "1"
+if HEADLESS:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
 import json
+import time
+import random
+import argparse
 import pygame
 import threading
 from typing import Dict
@@ -9,7 +21,7 @@ from combat import CombatManager
 from shops import MerchantStore
 from events.cutscenes import CutsceneManager
 from dialog.dialog import DialogManager
-from events.events import EventManager
+from events.events import EventManager, TimerManager
 from sound.sound import SoundDatabase
 from magic.magic import Spell, SpellBook
 from schedules.schedule import ScheduleManager
@@ -20,7 +32,11 @@ from tiles.tile_database import TileDatabase
 from quests.quests import QuestLog
 from items.itemz import Item, ItemDatabase
 from save_manager import SaveManager
-from objects.map_objects import Map, Node, MapObject, MapObjectDatabase, Teleporter, NPC, Monster
+from profiler import profiler, profiled
+from memory_monitor import MemoryMonitor
+from asset_manager import AssetManager
+from map_preloader import MapPreloader
+from objects.map_objects import Map, MapCollection, Node, MapObject, MapObjectDatabase, Teleporter, NPC, Monster
 from objects.object_templates import Missile
 
 from options import GameOptions
@@ -35,6 +51,8 @@ from inputs.quest_ui_inputs import quest_log_inputs
 from inputs.events_inputs import events_inputs
 from inputs.debug_inputs import debug_inputs
 from inputs.shop_ui_inputs import shop_inputs
+from inputs.scripted_input import ScriptedInput
+from inputs.input_recorder import InputRecorder, state_digest
 
 
 # Initialize Pygame
@@ -46,21 +64,47 @@ init_time = 420#in minutes
 init_cutscene = "opening"
 
 class GameEngine:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, headless: bool = HEADLESS, input_script: ScriptedInput = None, input_recorder: InputRecorder = None, max_fps: int = DEFAULT_MAX_FPS, vsync: bool = False):
+        #Seed before anything rolls dice, so recordings replay with the same rolls
+        if input_recorder:
+            random.seed(input_recorder.seed)
+        elif input_script and input_script.seed is not None:
+            random.seed(input_script.seed)
+        if vsync and not headless:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SCALED, vsync=1)
+        else:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(GAME_TITLE)
         self.clock = pygame.time.Clock()
         self.FPS = 60
+        self.max_fps = 0 if vsync else max_fps#vsync does the waiting instead
         self.running = True
+        #Game logic runs in fixed steps of SIM_STEP_MS on TimerManager.ticks, a virtual clock, and
+        #frames are drawn in between at whatever rate the machine manages (see while_running).
+        #Headless, recorded and replayed runs are lockstep instead: exactly one step per frame, so
+        #what happens can't depend on how fast frames were drawn. Headless engines also don't
+        #wait on the clock or flip the display.
+        self.headless = headless
+        self.input_script = input_script
+        self.input_recorder = input_recorder
+        self.lockstep = headless or bool(input_recorder) or bool(input_script)
+        TimerManager.ticks = 0
+        self.sim_accumulator = 0#ms of real time not yet simulated
+        self.sim_steps_last_frame = 0
+        self.frame_count = 0#simulation steps so far
+        self.memory_monitor = MemoryMonitor(self)
+        self.assets = AssetManager(self)
+        build = self.assets.build#Times each subsystem for the startup report
+        self.play_time = 0.0#seconds
         self.antialias_text = True
         # Game state
         self.state_stack = [GameState.MAIN_MENU]
 
-        self.item_db = ItemDatabase()
+        self.item_db = build("items", ItemDatabase)
         self.map_obj_db = MapObjectDatabase(self)
 
-        self.schedule_manager = ScheduleManager(self)
-        self.sound_manager = SoundDatabase()
+        self.schedule_manager = build("schedules", ScheduleManager, self)
+        self.sound_manager = build("sounds", SoundDatabase, self.assets)
         self.step_tracker = 1
         
         # Options and save system
@@ -70,15 +114,15 @@ class GameEngine:
         self.is_save_mode = False
 
         # Dialog system
-        self.dialog_manager = DialogManager(self)
+        self.dialog_manager = build("dialog", DialogManager, self)
         self.talk_mode = False  # True when waiting for direction after 'T' press
         self.look_mode = False
 
-        self.cutscene_manager = CutsceneManager(self)
-        self.save_manager = SaveManager(self)
-        self.event_manager = EventManager(self)
+        self.cutscene_manager = build("cutscenes", CutsceneManager, self)
+        self.save_manager = build("saves", SaveManager, self)
+        self.event_manager = build("events", EventManager, self)
 
-        self.merchant = MerchantStore(self)
+        self.merchant = build("shops", MerchantStore, self)
         # Equipment menu state
         self.selected_member = 0
         self.selected_slot = 0
@@ -87,10 +131,10 @@ class GameEngine:
         self.picking_item_to_show = False
         self.messages = ["", "", "", "", ""]
 
-        self.combat_manager = CombatManager(self)
+        self.combat_manager = build("combat", CombatManager, self)
         self.attack_mode = False
 
-        self.spellbook = SpellBook(self)
+        self.spellbook = build("spells", SpellBook, self)
         self.spell_input_mode = False
         self.spell_direction_mode = False
         self.spell_target_mode = False
@@ -99,20 +143,21 @@ class GameEngine:
         self.cursor_position = None
         self.oops = False
         
-        self.tile_db = TileDatabase(self)
-        self.sprite_db = SpriteDatabase(self)
+        self.tile_db = build("tiles", TileDatabase, self)
+        self.sprite_db = build("sprites", SpriteDatabase, self)
         # Initialize game objects (will be set when starting/loading game)
         self.party: Party = Party(self)
-        self.maps: Dict[str, Map] = {}
+        self.maps: MapCollection = MapCollection(self.save_manager.restore_map, self.save_manager.pack_map)
+        self.map_preloader = MapPreloader(self)
         self.visible_tiles: set[tuple[int, int]] = ()
-        self.current_map: Map = None
+        self._current_map: Map = None
         
 
-        self.quest_log = QuestLog(self)
+        self.quest_log = build("quests", QuestLog, self)
         self.current_quest_focus = 0
         self.selected_quest_indices = [0, 0, 0]
         
-        self.renderer = Renderer(self, self.screen)
+        self.renderer = build("renderer", Renderer, self, self.screen)
         
         # Camera
         self.camera = (0.0, 0.0)
@@ -120,6 +165,7 @@ class GameEngine:
         self.camera_override = (0.0, 0.0)
         self.prev_screen_x = 0
         self.prev_screen_y = 0
+        self.assets.build("sounds (decoding)", self.assets.wait_all, "sound ")
         
     def get_direction(self, key) -> Direction:
         direction = {
@@ -142,22 +188,41 @@ class GameEngine:
                 'X': Direction.WAIT
             }.get(key)
         return direction
+    @property
+    def current_map(self) -> Map:
+        return self._current_map
+    @current_map.setter
+    def current_map(self, new_map: Map):
+        #Anything can happen on the map the player is standing on, so it always needs saving again,
+        #including the map being left: what changed there since the last save isn't tracked.
+        if self._current_map:
+            self._current_map.dirty = True
+        if new_map:
+            new_map.dirty = True
+            self.maps.visit(new_map.name)
+        self._current_map = new_map
+        self.map_preloader.follow(new_map)
     @property 
     def state(self):
         return self.state_stack[-1]
     def replace_state(self, new_state: GameState):
+        old_state = self.state
         self.state_stack[-1] = new_state
-        self.adjust_repeat_rate()
-        print(self.state_stack)
+        self.on_state_changed(old_state)
     def change_state(self, state: GameState):
+        old_state = self.state
         self.state_stack.append(state)
-        self.adjust_repeat_rate()
-        print(self.state_stack)
+        self.on_state_changed(old_state)
     def revert_state(self):
         if len(self.state_stack) > 1:
-            self.state_stack.pop()
-            self.adjust_repeat_rate()
-            print(self.state_stack)
+            old_state = self.state_stack.pop()
+            self.on_state_changed(old_state)
+    def on_state_changed(self, old_state: GameState):
+        self.adjust_repeat_rate()
+        self.renderer.damage_all()
+        print(self.state_stack)
+        if GameState.COMBAT in [old_state, self.state] and old_state != self.state:
+            self.memory_monitor.checkpoint("enter combat" if self.state == GameState.COMBAT else "leave combat")
     def adjust_repeat_rate(self):
         if self.state in [GameState.DIALOG, GameState.EVENT, GameState.CUTSCENE]:
             pygame.key.set_repeat(1000, 1000)
@@ -181,7 +246,7 @@ class GameEngine:
                 self.party.add_item_by_id(name, quantity)
         
         # Load maps
-        self.maps = {}
+        self.maps = MapCollection(self.save_manager.restore_map, self.save_manager.pack_map)
         self.load_map("overworld")
         self.load_map(init_map)
         
@@ -189,7 +254,7 @@ class GameEngine:
         party_leader = self.party.get_leader()
         new_game_spawner = self.current_map.get_object_by_name(NEW_GAME_SPAWNER)
         party_leader.init_position = new_game_spawner.position
-        party_leader.position = new_game_spawner.position
+        party_leader.set_position(new_game_spawner.position)
         party_leader.map = self.current_map
         for i in self.party.members:
             self.current_map.add_object(i)
@@ -197,10 +262,12 @@ class GameEngine:
         if init_cutscene:
             self.cutscene_manager.start_scene(init_cutscene)
 
-    def load_map(self, map_name: str, updated_objs: dict = {}):
+    def load_map(self, map_name: str, updated_objs: dict = {}, objs_delta: dict = None):
         """Load a map from files"""
         try:
-            self.maps[map_name] = Map.load_from_files(map_name, self.map_obj_db, self.tile_db, self, updated_objs)
+            files = self.map_preloader.take(map_name)
+            self.maps[map_name] = Map.load_from_files(map_name, self.map_obj_db, self.tile_db, self, updated_objs, objs_delta, files)
+            self.memory_monitor.checkpoint(f"load map {map_name}")
             return True
         except (FileNotFoundError, ValueError) as e:
             print(f"Error loading map {map_name}: {e}")
@@ -241,7 +308,7 @@ class GameEngine:
                 if node and leader:
                     self.current_map.add_object(leader)
                     leader.old_position = node.position
-                    leader.position = node.position
+                    leader.set_position(node.position)
         elif "positions" in teleporter.args:
             # Multiple positions for party members (combat maps only, for now.)
             positions = teleporter.args["positions"]["from_any"]
@@ -250,7 +317,7 @@ class GameEngine:
                     node = self.current_map.get_object_by_name(positions + str(i))
                     self.current_map.add_object(self.party.members[i])
                     if node:
-                        self.party.members[i].position = node.position
+                        self.party.members[i].set_position(node.position)
         # Update game state based on target map
         if talking_to_someone:
             new_talker = self.current_map.get_object_by_name(talker.name)
@@ -353,10 +420,10 @@ class GameEngine:
             return entity.position
             
         # Calculate delta and interpolate
-        delta = entity.subtract_tuples(entity.position, entity.old_position)
-        return entity.add_tuples(entity.old_position, entity.multiply_tuples(delta, progress))
+        (x, y), (old_x, old_y) = entity.position, entity.old_position
+        return (old_x + (x - old_x) * progress, old_y + (y - old_y) * progress)
     
-    #@time_function("Update camera")
+    @profiled("camera")
     def update_camera(self):
         leader = self.party.get_leader()
         if not leader:
@@ -393,7 +460,7 @@ class GameEngine:
             return False
         if self.dialog_manager.start_dialog(obj):
             self.change_state(GameState.DIALOG)
-            self.party.get_leader().state = ObjectState.TALK
+            self.party.get_leader().set_state(ObjectState.TALK)
             return True
         
         return False  # No talkable object found
@@ -490,10 +557,15 @@ class GameEngine:
 
         return True
     
-    #@time_function("Handle Input: ")
+    @profiled("input")
     def handle_input(self):
         input_results_for_updates = {}
-        for event in pygame.event.get():
+        events = self.input_script.get() if self.input_script else pygame.event.get()
+        if self.input_recorder:
+            self.input_recorder.record(self.frame_count, events)
+        if events:
+            self.renderer.damage_all()
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
@@ -595,7 +667,7 @@ class GameEngine:
     
     def handle_save_load_selection(self):
         """Handle save/load menu selection"""
-        save_files = SaveManager.get_save_files()
+        save_files = self.save_manager.get_save_files()
         
         if self.is_save_mode:
             if self.selected_save == 0:
@@ -628,8 +700,25 @@ class GameEngine:
             self.update_world_after_action(movement_penalty)
 
 
-    #@time_function("Render Frame: ")  
+    def world_busy(self) -> bool:
+        """Whether dialog, an event, a cutscene or combat is playing out without waiting on the player"""
+        dialog_manager, event_manager = self.dialog_manager, self.event_manager
+        if dialog_manager.current_lines and not (dialog_manager.waiting_for_input or dialog_manager.awaiting_keyword):
+            return True
+        if event_manager.current_event_queue and not event_manager.waiting_for_input:
+            return True
+        return bool(event_manager.walkers or event_manager.delayed_events) or self.state in [GameState.COMBAT, GameState.CUTSCENE]
+
+    @profiled("render")
     def render(self):
+        damage = self.renderer.frame_damage()
+        self.renderer.last_frame_idle = not damage
+        if not damage:
+            return#Idle frame: nothing on screen could have changed
+        if len(damage) == 1 and damage[0] == self.screen.get_rect():
+            self.screen.set_clip(None)
+        else:
+            self.screen.set_clip(damage[0].unionall(damage[1:]))
         match self.state:
             case GameState.MAIN_MENU:
                 self.renderer.render_main_menu()
@@ -647,7 +736,7 @@ class GameEngine:
             case GameState.MENU_OPTIONS:
                 self.renderer.render_options_menu()
             case GameState.MENU_SAVE_LOAD:
-                save_files = SaveManager.get_save_files()
+                save_files = self.save_manager.get_save_files()
                 self.renderer.render_save_load_menu(save_files)
             case GameState.MENU_EQUIPMENT:
                 self.renderer.render_equipment_menu()
@@ -693,10 +782,54 @@ class GameEngine:
                         rect = pygame.Rect((x - self.camera[0])*TILE_WIDTH + TILE_WIDTH//2, (y - self.camera[1])*TILE_HEIGHT + TILE_HEIGHT//2, 8, 8)
                         pygame.draw.ellipse(self.screen, GRAY, rect)
         self.renderer.fade_render()
-        pygame.display.flip()
+        if self.renderer.show_perf_hud:
+            self.renderer.render_perf_hud()
+        self.screen.set_clip(None)
+        if not self.headless:
+            with profiler.span("flip"):
+                pygame.display.update(damage)
     
-    #@time_function("This Frame: ")
-    def while_running(self):
+    @profiled("objects")
+    def update_objects(self):
+        """
+        The map objects' part of a simulation step. Objects whose class has an update (the map's
+        updating_objects) run it while near the camera, and off screen only while they still need to.
+        Then movement that has finished settles: its timer is cancelled and old_position catches up.
+        """
+        game_map = self.current_map
+        cam_x, cam_y = self.camera
+        left, top = int(cam_x) - 1, int(cam_y) - 1
+        right, bottom = int(cam_x) + MAP_WIDTH + 1, int(cam_y) + MAP_HEIGHT + 1
+        for obj in list(game_map.updating_objects):
+            x, y = obj.position
+            if (left <= x <= right and top <= y <= bottom) or obj.needs_update():
+                obj.update()
+
+        timer_manager = self.event_manager.timer_manager
+        leader = self.party.get_leader()
+        for layer in game_map.get_objects_in_rect(left, top, right, bottom):
+            for obj in layer:
+                if obj is leader and timer_manager.is_active("player_bump"):
+                    if timer_manager.get_progress("player_bump") >= 1.0:
+                        obj.is_bumping = False
+                        obj.bump_direction = None
+                    continue
+                if obj.group and obj.group.progress:
+                    progress = obj.group.progress
+                else:
+                    timer_name = self.get_movement_timer_name(obj)
+                    if not timer_manager.is_active(timer_name):
+                        continue
+                    progress = timer_manager.get_progress(timer_name)
+                    if obj.group:
+                        obj.group.progress = progress
+                if progress >= 1.0:
+                    obj.old_position = obj.position
+
+    def simulate(self):
+        """One fixed step of game logic: input, the world update, events, dialog and combat"""
+        busy = self.world_busy()
+        self.renderer.advance_fade()
         if self.current_map:
             for group in self.current_map.groups.values():
                 group.checked_movement = False
@@ -721,35 +854,147 @@ class GameEngine:
                         self.dialog_manager.current_line_index += 1
                         self.dialog_manager.current_line = self.dialog_manager.get_current_line()
         input_results_for_updates = self.handle_input()
-        self.update(input_results_for_updates)
+        with profiler.span("update"):
+            self.update(input_results_for_updates)
         any_active = self.event_manager.timer_manager.any_active()
-        if self.dialog_manager.current_lines and not self.renderer.fading:
-            self.dialog_manager.advance_dialog()
-        if self.event_manager.current_event_queue and not self.renderer.fading and not self.state in [GameState.COMBAT, GameState.CUTSCENE]:
-            self.event_manager.advance_queue()
-        if self.event_manager.walkers:
-            self.event_manager.continue_walk()
+        with profiler.span("events"):
+            if self.dialog_manager.current_lines and not self.renderer.fading:
+                self.dialog_manager.advance_dialog()
+            if self.event_manager.current_event_queue and not self.renderer.fading and not self.state in [GameState.COMBAT, GameState.CUTSCENE]:
+                self.event_manager.advance_queue()
+            if self.event_manager.walkers:
+                self.event_manager.continue_walk()
         if self.state == GameState.COMBAT and not any_active:
-            self.combat_manager.advance_turn()
-            if self.combat_manager.player_turn:
-                self.combat_manager.update_special()
-        self.render()
-        self.clock.tick(self.FPS)  # Cap to 60 FPS
+            with profiler.span("combat"):
+                self.combat_manager.advance_turn()
+                if self.combat_manager.player_turn:
+                    self.combat_manager.update_special()
+        if self.current_map and self.party.members and self.state not in MENU_STATES and self.state != GameState.CUTSCENE:
+            self.update_objects()#The map is paused whenever it isn't on screen
+        if busy or self.world_busy():
+            self.renderer.damage_all()
+
+    def advance_simulation(self, step_ms: int):
+        TimerManager.ticks += step_ms
+        self.play_time += step_ms / 1000
+        self.simulate()
+        self.frame_count += 1
+
+    def while_running(self):
+        profiler.begin_frame()
+        self.assets.pump()
+        self.save_manager.report_failed_writes()
+        if self.lockstep:
+            step_ms = SIM_STEP_MS
+            if self.input_script:
+                step_ms = self.input_script.frame_length(self.frame_count, step_ms)
+            if self.input_recorder:
+                self.input_recorder.frame_lengths.append(step_ms)
+            self.advance_simulation(step_ms)
+            self.sim_steps_last_frame = 1
+            self.render()
+            if not self.headless:
+                self.clock.tick(self.FPS)#One step per frame, so frames have to keep the game's pace
+        else:
+            #Real time since the last frame is simulated in whole steps; under load several steps run
+            #before the next frame is drawn (frame skipping), up to MAX_SIM_STEPS_PER_FRAME, after which
+            #the game slows down rather than falling further and further behind
+            #Uncapped drawing still waits while idle, rather than spinning through empty frames
+            max_fps = self.max_fps or (DEFAULT_MAX_FPS if self.renderer.last_frame_idle else 0)
+            self.sim_accumulator = min(self.sim_accumulator + self.clock.tick(max_fps), SIM_STEP_MS * MAX_SIM_STEPS_PER_FRAME)
+            self.sim_steps_last_frame = 0
+            while self.sim_accumulator >= SIM_STEP_MS:
+                self.advance_simulation(SIM_STEP_MS)
+                self.sim_accumulator -= SIM_STEP_MS
+                self.sim_steps_last_frame += 1
+            #The leftover is how far into the next step this frame falls. Drawing with the clock
+            #moved forward by that much interpolates movement and animations between the last
+            #simulated state and the next one, since they're all driven by timer progress.
+            TimerManager.ticks += self.sim_accumulator
+            try:
+                self.render()
+            finally:
+                TimerManager.ticks -= self.sim_accumulator
+        profiler.end_frame()
         
     def run(self):
         # Load options on startup
         self.load_options()
+        self.sprite_db.queue_preload(self.assets)#Decoded while the player is still in the main menu
         
         while self.running:
             self.while_running()
-            
+        self.assets.stop()
+        if self.input_recorder:
+            self.input_recorder.save(self)
+        self.save_manager.writer.flush()
         pygame.quit()
 
+    def step(self, frames: int = 1):
+        """Advance the game by a number of frames, as fast as the CPU allows when headless"""
+        for _ in range(frames):
+            if not self.running:
+                break
+            self.while_running()
+
+    def run_headless(self, max_frames: int = None) -> dict:
+        """Play until the input script runs out (or max_frames pass) and report how fast it went"""
+        start_frame = self.frame_count
+        start_time = self.schedule_manager.current_game_time
+        start = time.perf_counter()
+        while self.running:
+            if max_frames is not None and self.frame_count - start_frame >= max_frames:
+                break
+            if max_frames is None and (not self.input_script or self.input_script.finished()):
+                break
+            self.while_running()
+        elapsed = time.perf_counter() - start
+        frames = self.frame_count - start_frame
+        if self.input_recorder:
+            self.input_recorder.save(self)
+        self.save_manager.writer.flush()
+        return {
+            "frames" : frames,
+            "seconds" : elapsed,
+            "fps" : frames / elapsed if elapsed else 0.0,
+            "game_minutes" : (self.schedule_manager.current_game_time - start_time).total_seconds() / 60
+        }
+
 # Main execution
 if __name__ == "__main__":
-    # Start memory monitor in background
-    #threading.Thread(target=monitor_memory, daemon=True).start()
-    #threading.Thread(target = time_function, daemon = True)
     
-    game = GameEngine()
-    game.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--headless", action="store_true", help="no window or sound, run as fast as possible")
+    parser.add_argument("--script", help="json file of {frame: [key names]} to play instead of the keyboard")
+    parser.add_argument("--load", help="save folder to load before running")
+    parser.add_argument("--frames", type=int, help="headless only: stop after this many frames")
+    parser.add_argument("--record", help="record the session's input to this json file")
+    parser.add_argument("--seed", type=int, help="RNG seed for a recorded session")
+    parser.add_argument("--memory", action="store_true", help="sample memory and report it on exit")
+    parser.add_argument("--fps", type=int, default=DEFAULT_MAX_FPS, help="cap on frames drawn per second, 0 for uncapped (game logic always runs at the same rate)")
+    parser.add_argument("--vsync", action="store_true", help="draw in step with the display's refresh rate")
+    parser.add_argument("--startup-report", action="store_true", help="print how long each subsystem took to load")
+    args = parser.parse_args()
+    
+    input_script = ScriptedInput.from_file(args.script) if args.script else None
+    load = args.load or (input_script.load if input_script else None)
+    input_recorder = InputRecorder(args.record, args.seed, load) if args.record else None
+    game = GameEngine(args.headless, input_script, input_recorder, args.fps, args.vsync)
+    if args.startup_report:
+        game.assets.report()
+    if args.memory:
+        game.memory_monitor.enable()
+    if load:
+        game.save_manager.load_game(load)
+    if args.headless:
+        print(game.run_headless(args.frames))
+        pygame.quit()
+    else:
+        game.run()
+    if args.memory:
+        game.memory_monitor.disable()
+        game.memory_monitor.report()
+    if input_script and input_script.frame_lengths:
+        with open(args.script, 'r') as f:
+            recorded_digest = json.load(f).get("digest")
+        print("Replay matches recording" if recorded_digest == state_digest(game) else "Replay diverged from recording")
\ No newline at end of file
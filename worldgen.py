@@ -0,0 +1,155 @@
+"""
+Synthetic world generator for scaling tests.
+
+Writes ordinary maps/<name>/ folders (map, tiles, levels and objs files) far bigger than
+anything shipped, full of scheduled NPCs with patrol routes and teleporters linking the
+generated maps to each other. The NPCs' schedules go to schedules/schedule_<name>.json,
+which ScheduleManager loads on top of the hand-written schedule.json.
+
+    python worldgen.py generate <name> [--size 512x512] [--maps 1] [--npcs 2000] [--teleporters 50] [--seed 0]
+    python worldgen.py remove <name>
+"""
+
+import os
+import json
+import random
+import shutil
+import argparse
+from typing import Dict, List, Tuple
+from constants import MAPS_DIR, SKEJ_DIR, NEW_GAME_SPAWNER
+
+TILE_CHARS = {".": "grass", "/": "floorstone", "l": "floorsoil", "~": "water", "B": "wallbrick"}
+PASSABLE_CHARS = "./l"
+PATROL_LENGTH = 4
+PATROL_RADIUS = 8
+
+def schedule_file(world_name: str) -> str:
+    return os.path.join(SKEJ_DIR, f"schedule_{world_name}.json")
+
+def map_names(world_name: str, map_count: int) -> List[str]:
+    return [world_name] if map_count == 1 else [f"{world_name}_{i}" for i in range(map_count)]
+
+def generate_tiles(rng: random.Random, width: int, height: int) -> List[List[str]]:
+    """Grass crossed by stone roads, with brick buildings (soil floors, one door) and ponds scattered over it"""
+    rows = [["." for _ in range(width)] for _ in range(height)]
+    for y in range(0, height, 24):
+        for x in range(width):
+            rows[y][x] = "/"
+    for x in range(0, width, 24):
+        for y in range(height):
+            rows[y][x] = "/"
+    for _ in range(width * height // 400):
+        w, h = rng.randint(4, 10), rng.randint(4, 8)
+        left, top = rng.randint(1, max(1, width - w - 1)), rng.randint(1, max(1, height - h - 1))
+        kind = rng.random()
+        for y in range(top, min(top + h, height - 1)):
+            for x in range(left, min(left + w, width - 1)):
+                if rows[y][x] == "/":
+                    continue
+                if kind < 0.2:
+                    rows[y][x] = "~"
+                else:
+                    on_edge = y in (top, top + h - 1) or x in (left, left + w - 1)
+                    rows[y][x] = "B" if on_edge else "l"
+        if kind >= 0.2:
+            rows[min(top + h - 1, height - 2)][left + w // 2] = "l"#door
+    return rows
+
+def random_passable(rng: random.Random, rows: List[List[str]], taken: set, near: Tuple[int, int] = None) -> Tuple[int, int]:
+    height, width = len(rows), len(rows[0])
+    while True:
+        if near:
+            x = min(max(near[0] + rng.randint(-PATROL_RADIUS, PATROL_RADIUS), 0), width - 1)
+            y = min(max(near[1] + rng.randint(-PATROL_RADIUS, PATROL_RADIUS), 0), height - 1)
+        else:
+            x, y = rng.randrange(width), rng.randrange(height)
+        if rows[y][x] in PASSABLE_CHARS and (x, y) not in taken:
+            return x, y
+
+def generate_world(world_name: str, width: int = 512, height: int = 512, map_count: int = 1, npcs: int = 2000, teleporters: int = 50, seed: int = 0) -> List[str]:
+    """Write the maps of a generated world and add its NPCs' schedules. Returns the map names."""
+    rng = random.Random(seed)
+    names = map_names(world_name, map_count)
+    schedules = {}
+    objects_by_map: Dict[str, dict] = {}
+    tiles_by_map: Dict[str, List[List[str]]] = {}
+    taken_by_map: Dict[str, set] = {}
+    for map_index, map_name in enumerate(names):
+        rows = generate_tiles(rng, width, height)
+        taken = set()
+        objects = {NEW_GAME_SPAWNER : {"object_type" : "node", "position" : list(random_passable(rng, rows, taken))}}
+        for npc_index in range(npcs // map_count + (map_index < npcs % map_count)):
+            npc_name = f"{map_name}_npc_{npc_index}"
+            position = random_passable(rng, rows, taken)
+            taken.add(position)
+            objects[npc_name] = {
+                "object_type" : "npc",
+                "move_interval" : rng.choice([1, 2, 5]),
+                "args" : {"name" : f"Townsperson {npc_index}", "spritesheet" : ["Generic People", 0, 6]},
+                "position" : list(position)
+            }
+            for node_index in range(PATROL_LENGTH):
+                objects[f"{npc_name}_patrol_{node_index}"] = {"object_type" : "node", "position" : list(random_passable(rng, rows, set(), position))}
+            objects[f"{npc_name}_home"] = {"object_type" : "node", "position" : list(position)}
+            start_hour = rng.randint(5, 9)
+            schedules[npc_name] = {
+                f"{start_hour:02d}:{rng.choice([0, 15, 30, 45]):02d}" : {"action" : "patrol", "patrol_node_template" : f"{npc_name}_patrol", "start_node" : "0", "max_node" : PATROL_LENGTH},
+                f"{start_hour + 11:02d}:00" : {"action" : "go_to", "target" : f"{npc_name}_home"}
+            }
+        objects_by_map[map_name] = objects
+        tiles_by_map[map_name] = rows
+        taken_by_map[map_name] = taken
+
+    #Teleporters come in pairs: stepping on one lands you next to its partner on the other map
+    for teleporter_index in range(teleporters if map_count > 1 else 0):
+        from_map, to_map = rng.sample(names, 2)
+        for source, target in [(from_map, to_map), (to_map, from_map)]:
+            position = random_passable(rng, tiles_by_map[source], taken_by_map[source])
+            taken_by_map[source].add(position)
+            objects_by_map[source][f"teleporter_{teleporter_index}_to_{target}"] = {
+                "object_type" : "teleporter",
+                "args" : {"target_map" : target, "position" : {"from_any" : f"teleporter_{teleporter_index}_landing_{target}"}},
+                "position" : list(position)
+            }
+            landing = random_passable(rng, tiles_by_map[source], taken_by_map[source], position)
+            objects_by_map[source][f"teleporter_{teleporter_index}_landing_{source}"] = {"object_type" : "node", "position" : list(landing)}
+
+    for map_name in names:
+        map_folder = os.path.join(MAPS_DIR, map_name)
+        os.makedirs(map_folder, exist_ok=True)
+        with open(os.path.join(map_folder, f"map_{map_name}.txt"), 'w', encoding='utf-8') as f:
+            f.write("\n".join("".join(row) for row in tiles_by_map[map_name]))
+        with open(os.path.join(map_folder, f"levels_{map_name}.txt"), 'w', encoding='utf-8') as f:
+            f.write("\n".join("1" * width for _ in range(height)))
+        with open(os.path.join(map_folder, f"tiles_{map_name}.json"), 'w', encoding='utf-8') as f:
+            json.dump(TILE_CHARS, f, indent=2)
+        with open(os.path.join(map_folder, f"objs_{map_name}.json"), 'w') as f:
+            json.dump(objects_by_map[map_name], f, indent=2)
+
+    with open(schedule_file(world_name), 'w') as f:
+        json.dump(schedules, f, indent=2)
+    return names
+
+def remove_world(world_name: str):
+    """Delete a generated world's map folders and schedules"""
+    for folder in os.listdir(MAPS_DIR):
+        if folder == world_name or (folder.startswith(f"{world_name}_") and folder[len(world_name) + 1:].isdigit()):
+            shutil.rmtree(os.path.join(MAPS_DIR, folder))
+    if os.path.exists(schedule_file(world_name)):
+        os.remove(schedule_file(world_name))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["generate", "remove"])
+    parser.add_argument("name")
+    parser.add_argument("--size", default="512x512", help="WIDTHxHEIGHT of each map")
+    parser.add_argument("--maps", type=int, default=1)
+    parser.add_argument("--npcs", type=int, default=2000, help="scheduled NPCs across the whole world")
+    parser.add_argument("--teleporters", type=int, default=50, help="teleporter pairs between the world's maps")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.command == "generate":
+        width, height = map(int, args.size.lower().split("x"))
+        print(generate_world(args.name, width, height, args.maps, args.npcs, args.teleporters, args.seed))
+    else:
+        remove_world(args.name)